@@ -1,10 +1,37 @@
+import functools
 import os
+import shutil
 
 from flask import Flask
 
+from .db import apply_sqlite_pragmas
 from .db import db as agenda_db
 
 
+def _fast_migrate(src: str, dst: str) -> None:
+    """Copy a database file using the cheapest mechanism available.
+
+    Tries an in-kernel copy_file_range (reflink on btrfs/XFS), falling back
+    to shutil.copyfile. Never hardlinks: SQLite keeps -wal/-journal per file
+    name, so two links to one database can corrupt it, and the old file must
+    stay a backup. The copy goes to a temporary name and is moved into place
+    with os.replace, so a failed copy never leaves a partial ``dst`` behind.
+    File metadata is not preserved; it is irrelevant for SQLite files.
+    """
+    tmp = f"{dst}.tmp-{os.getpid()}"
+    try:
+        try:
+            with open(src, "rb") as s, open(tmp, "wb") as d:
+                while os.copy_file_range(s.fileno(), d.fileno(), 1 << 30) > 0:
+                    pass
+        except (OSError, AttributeError):
+            shutil.copyfile(src, tmp)
+        os.replace(tmp, dst)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
 def init_agenda(
     app: Flask,
     *,
@@ -52,6 +79,9 @@ def init_agenda(
         app.config.setdefault("SQLALCHEMY_DATABASE_URI", database_uri)
         app.config.setdefault("SQLALCHEMY_TRACK_MODIFICATIONS", False)
         local_db.init_app(app)
+        with app.app_context():
+            for engine in local_db.engines.values():
+                apply_sqlite_pragmas(engine)
 
     # Import blueprint and models only after binding the correct db instance
     from .routes import bp as bp_agenda  # local import to avoid cycles, after db binding
@@ -62,17 +92,15 @@ def init_agenda(
     # Optionally create tables
     if auto_create_db:
         # One-time migration: if there are DBs under old agenda/instance,
-        # copy them into app.instance_path (non-destructive).
+        # copy them into app.instance_path (never overwrites).
         try:
-            import shutil
-
             old_instance = os.path.join(os.path.dirname(__file__), "instance")
             for fname in ("calendario.db", "pacientes.db", "users.db"):
                 old_f = os.path.join(old_instance, fname)
                 new_f = os.path.join(app.instance_path, fname)
                 if os.path.exists(old_f) and not os.path.exists(new_f):
                     os.makedirs(os.path.dirname(new_f), exist_ok=True)
-                    shutil.copy2(old_f, new_f)
+                    _fast_migrate(old_f, new_f)
         except Exception:
             # Best-effort only
             pass
@@ -82,18 +110,16 @@ def init_agenda(
             except Exception:
                 # Tables may already exist or be managed externally
                 pass
+            from .routes import _ensure_calendar_schema
 
+            _ensure_calendar_schema()
 
-def create_app(
-    *,
-    config: dict | None = None,
-    database_uri: str | None = None,
-    url_prefix: str = "",
-) -> Flask:
-    """App factory that returns a standalone Flask app with Agenda.
 
-    Accepts optional config and database_uri to ease reuse.
-    """
+def _build_app(
+    config: dict | None,
+    database_uri: str | None,
+    url_prefix: str,
+) -> Flask:
     # Default instance folder placed at repo/app root: ../instance
     default_instance = os.path.abspath(
         os.path.join(os.path.dirname(__file__), os.pardir, "instance")
@@ -117,6 +143,39 @@ def create_app(
     return app
 
 
+@functools.lru_cache(maxsize=8)
+def _create_app_cached(
+    config_items: tuple,
+    database_uri: str | None,
+    url_prefix: str,
+) -> Flask:
+    return _build_app(dict(config_items), database_uri, url_prefix)
+
+
+def create_app(
+    *,
+    config: dict | None = None,
+    database_uri: str | None = None,
+    url_prefix: str = "",
+) -> Flask:
+    """App factory that returns a standalone Flask app with Agenda.
+
+    Accepts optional config and database_uri to ease reuse. Calls with the
+    same (config, database_uri, url_prefix) return the same app instance;
+    use create_app.cache_clear() when a fresh app is required (e.g. tests).
+    """
+    try:
+        config_items = tuple(sorted((config or {}).items()))
+        hash(config_items)
+    except TypeError:
+        # Unhashable/unsortable config values: build without memoization
+        return _build_app(config, database_uri, url_prefix)
+    return _create_app_cached(config_items, database_uri, url_prefix)
+
+
+create_app.cache_clear = _create_app_cached.cache_clear  # type: ignore[attr-defined]
+
+
 # Optional public exports for convenience in host apps
 try:  # pragma: no cover - convenience only
     from .routes import bp as agenda_blueprint  # noqa: WPS433
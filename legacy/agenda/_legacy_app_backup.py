@@ -1,18 +1,90 @@
 import datetime as dt
+import functools
+import hashlib
 import os
-import sqlite3
+import re
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from types import MappingProxyType
 
-from flask import Flask, jsonify, render_template, request
+from dateutil.parser import parse as _du_parse
+from flask import Flask, Response, jsonify, render_template, request
+from flask.json.provider import DefaultJSONProvider
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import create_engine, or_, text
+from sqlalchemy import (
+    and_,
+    bindparam,
+    create_engine,
+    delete,
+    event,
+    func,
+    literal,
+    or_,
+    select,
+    text,
+    update,
+)
+from sqlalchemy.pool import QueuePool
 
 try:
     import requests  # type: ignore
 except Exception:
     requests = None  # will be validated at runtime
 
+# Sessão HTTP reaproveitada (keep-alive + pool) para a API Invertexto:
+# evita um handshake TLS a cada refresh de feriados.
+_HTTP = None
+if requests is not None:
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    _HTTP = requests.Session()
+    _HTTP.headers.update({"User-Agent": "odontoclin2"})
+    _HTTP.mount(
+        "https://",
+        HTTPAdapter(
+            pool_connections=4,
+            pool_maxsize=4,
+            # raise_on_status=False: esgotadas as tentativas, devolve a
+            # resposta final para as mensagens por status (401/429/...)
+            max_retries=Retry(
+                total=2,
+                backoff_factor=0.3,
+                status_forcelist=[429, 502, 503],
+                raise_on_status=False,
+            ),
+        ),
+    )
+
+try:
+    import orjson  # type: ignore
+except Exception:
+    orjson = None  # fallback: jsonify (json da stdlib)
+
 app = Flask(__name__)
+
+
+class _OrjsonProvider(DefaultJSONProvider):
+    """jsonify/request.get_json via orjson (mesmas opções do provider padrão:
+    chaves ordenadas, indentação em debug e default para tipos extras)."""
+
+    def dumps(self, obj, **kwargs) -> str:
+        option = orjson.OPT_NON_STR_KEYS
+        if kwargs.get("sort_keys", self.sort_keys):
+            option |= orjson.OPT_SORT_KEYS
+        if kwargs.get("indent"):
+            option |= orjson.OPT_INDENT_2
+        default = kwargs.get("default", self.default)
+        return orjson.dumps(obj, default=default, option=option).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+
+if orjson is not None:
+    app.json = _OrjsonProvider(app)
 # Usar caminho absoluto para o banco dentro de instance/
 # (evita problemas de path no Windows)
 basedir = os.path.abspath(os.path.dirname(__file__))
@@ -22,8 +94,53 @@ app.config["SQLALCHEMY_DATABASE_URI"] = db_uri
 app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 db = SQLAlchemy(app)
 
+# Engines com pool para os bancos auxiliares (pacientes.db / users.db).
+# Reaproveitados entre requisições: evita reabrir o arquivo SQLite
+# (e aquecer o page cache) a cada chamada dos endpoints de lookup.
+pacientes_db_file = os.path.join(basedir, "instance", "pacientes.db")
+users_db_file = os.path.join(basedir, "instance", "users.db")
+pacientes_engine = create_engine(
+    "sqlite:///" + pacientes_db_file.replace("\\", "/"),
+    poolclass=QueuePool,
+    pool_size=5,
+    max_overflow=5,
+    pool_pre_ping=True,
+)
+users_engine = create_engine(
+    "sqlite:///" + users_db_file.replace("\\", "/"),
+    poolclass=QueuePool,
+    pool_size=5,
+    max_overflow=5,
+    pool_pre_ping=True,
+)
+
+
+# PRAGMAs aplicados a cada nova conexão dos três bancos (com pool, o custo
+# fica amortizado): WAL libera leitores durante escritas, synchronous=NORMAL
+# reduz fsyncs e mmap/cache_size evitam syscalls de leitura.
+def _sqlite_pragmas_on_connect(dbapi_connection, connection_record):
+    cur = dbapi_connection.cursor()
+    try:
+        try:
+            cur.execute("PRAGMA journal_mode=WAL")
+        except Exception:
+            # banco somente leitura/bloqueado: seguir com o journal atual
+            pass
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA mmap_size=268435456")
+        cur.execute("PRAGMA cache_size=-20000")
+    finally:
+        cur.close()
+
 
-# Helpers: timezone-aware UTC now and coercion for cached values
+for _engine in (pacientes_engine, users_engine):
+    event.listen(_engine, "connect", _sqlite_pragmas_on_connect)
+with app.app_context():
+    event.listen(db.engine, "connect", _sqlite_pragmas_on_connect)
+
+
+# Helpers: timezone-aware UTC now
 # UTC constant from datetime module (Python 3.11+)
 UTC = dt.UTC
 
@@ -32,21 +149,24 @@ def _utcnow() -> datetime:
     return datetime.now(UTC)
 
 
-def _ensure_aware_utc(d: datetime | None) -> datetime | None:
-    if d is None:
-        return None
-    try:
-        if d.tzinfo is None:
-            return d.replace(tzinfo=UTC)
-        return d.astimezone(UTC)
-    except Exception:
-        return d
+def _json_response(payload) -> Response:
+    """Serializa com orjson quando disponível (endpoints de listagem)."""
+    if orjson is None:
+        return jsonify(payload)
+    return Response(orjson.dumps(payload), mimetype="application/json")
 
 
 # SQLAlchemy model for events
 
 
 class CalendarEvent(db.Model):
+    # Índices para o filtro de intervalo (end >= :start AND start < :end)
+    # e para o filtro por dentista usados em /events.
+    __table_args__ = (
+        db.Index("ix_event_range", "end", "start"),
+        db.Index("ix_event_prof", "profissional_id"),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(120), nullable=False)
     start = db.Column(db.String(30), nullable=False)
@@ -55,6 +175,8 @@ class CalendarEvent(db.Model):
     notes = db.Column(db.String(500), nullable=True)
     # Novo: vínculo opcional ao dentista (users.id em instance/users.db)
     profissional_id = db.Column(db.Integer, nullable=True)
+    # Última alteração: base do ETag de /events e /events/search_range
+    updated_at = db.Column(db.DateTime, default=_utcnow, onupdate=_utcnow, index=True)
 
     def __init__(
         self,
@@ -73,27 +195,30 @@ class CalendarEvent(db.Model):
         self.profissional_id = profissional_id
 
     def to_dict(self):
-        from dateutil.parser import parse
-
-        try:
-            start_dt = parse(self.start)
-            end_dt = parse(self.end)
-            if len(self.start) == 10 and len(self.end) == 10:
-                all_day = True
-            elif (
-                start_dt.hour == 0
-                and start_dt.minute == 0
-                and start_dt.second == 0
-                and end_dt.hour == 0
-                and end_dt.minute == 0
-                and end_dt.second == 0
-                and (end_dt - start_dt).total_seconds() % 86400 == 0
-            ):
-                all_day = True
-            else:
+        # Armazenamento é normalizado (normalize_for_storage): YYYY-MM-DD
+        # ou YYYY-MM-DDTHH:MM:SS, então o caso comum dispensa parsing.
+        if len(self.start) == 10 and len(self.end) == 10:
+            all_day = True
+        else:
+            try:
+                try:
+                    start_dt = datetime.fromisoformat(self.start)
+                    end_dt = datetime.fromisoformat(self.end)
+                except ValueError:
+                    # Strings legadas fora do padrão ISO
+                    start_dt = _du_parse(self.start)
+                    end_dt = _du_parse(self.end)
+                all_day = (
+                    start_dt.hour == 0
+                    and start_dt.minute == 0
+                    and start_dt.second == 0
+                    and end_dt.hour == 0
+                    and end_dt.minute == 0
+                    and end_dt.second == 0
+                    and (end_dt - start_dt).total_seconds() % 86400 == 0
+                )
+            except Exception:
                 all_day = False
-        except Exception:
-            all_day = False
         return {
             "id": self.id,
             "title": self.title,
@@ -107,6 +232,18 @@ class CalendarEvent(db.Model):
         }
 
 
+# Colunas lidas pelos endpoints de listagem (profissional_id por último)
+_EVENT_COLS = (
+    CalendarEvent.id,
+    CalendarEvent.title,
+    CalendarEvent.start,
+    CalendarEvent.end,
+    CalendarEvent.color,
+    CalendarEvent.notes,
+    CalendarEvent.profissional_id,
+)
+
+
 # Simple key-value settings table (e.g., to store Invertexto token)
 class AppSetting(db.Model):
     __tablename__ = "app_settings"
@@ -118,6 +255,8 @@ class AppSetting(db.Model):
 # Holidays table to cache Invertexto results (not treated as events)
 class Holiday(db.Model):
     __tablename__ = "holidays"
+    # DELETE por ano (refresh) e /holidays/year; o range por data usa a PK
+    __table_args__ = (db.Index("ix_holidays_year_date", "year", "date"),)
     date = db.Column(db.String(10), primary_key=True)  # YYYY-MM-DD
     name = db.Column(db.String(200), nullable=False)
     # feriado | facultativo | ...
@@ -165,161 +304,189 @@ def delete_setting(key: str) -> None:
         db.session.commit()
 
 
-def _load_valid_dentist_ids() -> set[int]:
+# Token da Invertexto e o header Authorization montados uma vez: lidos do
+# banco no primeiro refresh e atualizados quando a rota de settings grava.
+_TOKEN_CACHE: dict = {"loaded": False, "val": None, "header": None}
+
+
+def _set_token_cache(token: str | None) -> None:
+    _TOKEN_CACHE["val"] = token
+    _TOKEN_CACHE["header"] = {"Authorization": f"Bearer {token}"} if token else None
+    _TOKEN_CACHE["loaded"] = True
+
+
+def _invertexto_auth() -> tuple[str | None, dict | None]:
+    if not _TOKEN_CACHE["loaded"]:
+        _set_token_cache(get_setting("invertexto_token"))
+    return _TOKEN_CACHE["val"], _TOKEN_CACHE["header"]
+
+
+# Esquema de users.db resolvido uma única vez por mtime:
+# db_path -> (mtime, name_col, color_col, select_sql). name_col None = sem coluna id.
+_SCHEMA_CACHE: dict[str, tuple[int, str | None, str | None, str | None]] = {}
+
+
+def _users_schema(conn, db_path: str, mtime_ns: int):
+    """Retorna (name_col, color_col, select_sql) da tabela users.
+
+    O PRAGMA table_info só roda quando o mtime de users.db muda; nos demais
+    casos reaproveita as colunas e o SELECT já montados.
+    """
+    cached = _SCHEMA_CACHE.get(db_path)
+    if cached and cached[0] == mtime_ns:
+        return cached[1], cached[2], cached[3]
+    cols = [row[1] for row in conn.exec_driver_sql("PRAGMA table_info(users)")]
+    name_col: str | None = None
+    color_col: str | None = None
+    select_sql: str | None = None
+    if "id" in cols:
+        name_candidates = [
+            "nome_profissional",
+            "nome",
+            "name",
+            "full_name",
+            "username",
+        ]
+        name_col = next((c for c in name_candidates if c in cols), None) or "id"
+        color_col = "color" if "color" in cols else ("cor" if "cor" in cols else None)
+        select_sql = (
+            f"SELECT id, {name_col}{', ' + color_col if color_col else ''} "
+            f"FROM users ORDER BY {name_col}"
+        )
+    _SCHEMA_CACHE[db_path] = (mtime_ns, name_col, color_col, select_sql)
+    return name_col, color_col, select_sql
+
+
+def _load_valid_dentist_ids() -> frozenset[int]:
     """Carrega os IDs válidos de dentistas a partir de instance/users.db.
-    Em caso de erro ou arquivo inexistente, retorna set() (nenhum válido
-    conhecido).
+    Em caso de erro ou arquivo inexistente, retorna frozenset() (nenhum
+    válido conhecido).
     """
-    # Cache em memória (TTL + mtime do arquivo)
-    # Evita reabrir o DB a cada requisição de /events sem seleção de dentistas
+    # Cache em memória invalidado pelo mtime do arquivo (qualquer escrita em
+    # users.db altera st_mtime_ns). Evita reabrir o DB a cada requisição de
+    # /events sem seleção de dentistas.
     try:
-        db_path = os.path.join(basedir, "instance", "users.db")
-        if not os.path.exists(db_path):
-            return set()
-        # atributos de cache
-        now = _utcnow()
-        ttl = timedelta(seconds=60)
-        mtime = os.path.getmtime(db_path)
+        db_path = users_db_file
+        try:
+            mtime_ns = os.stat(db_path).st_mtime_ns
+        except FileNotFoundError:
+            return frozenset()
+        gen = _DENTISTS_GEN
         cache = getattr(_load_valid_dentist_ids, "_cache", None)
-        if cache and isinstance(cache, dict):
-            last_mtime = cache.get("mtime")
-            cached_at = _ensure_aware_utc(cache.get("at"))
-            cached_ids = cache.get("ids")
-            if (
-                cached_ids is not None
-                and last_mtime == mtime
-                and cached_at
-                and (now - cached_at) <= ttl
-            ):
-                return cached_ids  # type: ignore[return-value]
+        if cache and cache["mtime"] == mtime_ns and cache["gen"] == gen:
+            return cache["ids"]
         # recarregar do DB
-        conn = sqlite3.connect(db_path)
-        try:
-            cur = conn.cursor()
-            cur.execute("PRAGMA table_info(users)")
-            cols = [row[1] for row in cur.fetchall()]
-            if "id" not in cols:
-                ids: set[int] = set()
+        with users_engine.connect() as conn:
+            name_col, _color_col, _sql = _users_schema(conn, db_path, mtime_ns)
+            if name_col is None:
+                ids: frozenset[int] = frozenset()
             else:
-                cur.execute("SELECT id FROM users")
-                ids = {int(r[0]) for r in cur.fetchall() if r and r[0] is not None}
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
+                rows = conn.exec_driver_sql("SELECT id FROM users")
+                ids = frozenset(int(r[0]) for r in rows if r and r[0] is not None)
         # salvar cache
         setattr(
             _load_valid_dentist_ids,
             "_cache",
-            {"ids": ids, "mtime": mtime, "at": now},
+            {"ids": ids, "mtime": mtime_ns, "gen": gen},
         )
         return ids
     except Exception:
-        return set()
+        return frozenset()
+
+
+def _orphan_prof_ids() -> frozenset[int]:
+    """profissional_id presentes em calendar_event sem dentista válido.
+
+    O filtro "apenas inválidos" vira um IN curto (seek em ix_event_prof) em
+    vez de NOT IN com todos os ids válidos. Recalculado quando users.db muda
+    ou quando algum evento altera profissional_id (_EVENTS_PROF_GEN).
+    """
+    valid_ids = _load_valid_dentist_ids()
+    gen = _EVENTS_PROF_GEN
+    cache = getattr(_orphan_prof_ids, "_cache", None)
+    if cache and cache["valid"] is valid_ids and cache["gen"] == gen:
+        return cache["ids"]
+    try:
+        rows = db.session.execute(
+            select(CalendarEvent.profissional_id)
+            .where(CalendarEvent.profissional_id.is_not(None))
+            .distinct()
+        )
+        ids = frozenset(r[0] for r in rows) - valid_ids
+    except Exception:
+        db.session.rollback()
+        return frozenset()
+    setattr(_orphan_prof_ids, "_cache", {"ids": ids, "valid": valid_ids, "gen": gen})
+    return ids
 
 
 # ===== Server-side caches (in-memory) =====
 # Dentists list cache: avoid hitting users.db repeatedly.
-def _load_dentists_list_cached(
-    ttl_seconds: int = 300,
-) -> tuple[list[dict], float]:
+def _load_dentists_list_cached() -> tuple[list[dict], float]:
     """Return (dentists_list, users_db_mtime).
 
-    Caches by users.db mtime and a TTL. If users.db is missing or the table is
-    incompatible, returns empty list with mtime=0.
+    Caches by users.db mtime (invalidation only, no TTL). If users.db is
+    missing or the table is incompatible, returns empty list with mtime=0.
     """
     try:
-        db_path = os.path.join(basedir, "instance", "users.db")
-        if not os.path.exists(db_path):
+        db_path = users_db_file
+        try:
+            st = os.stat(db_path)
+        except FileNotFoundError:
             return [], 0.0
-        now = _utcnow()
-        mtime = os.path.getmtime(db_path)
+        mtime = st.st_mtime
+        gen = _DENTISTS_GEN
         cache = getattr(_load_dentists_list_cached, "_cache", None)
-        if cache and isinstance(cache, dict):
-            last_mtime = cache.get("mtime")
-            cached_at = _ensure_aware_utc(cache.get("at"))
-            dentists = cache.get("dentists") or []
-            if (
-                dentists is not None
-                and last_mtime == mtime
-                and cached_at
-                and (now - cached_at) <= timedelta(seconds=ttl_seconds)
-            ):
-                return dentists, mtime  # type: ignore[return-value]
+        if cache and cache["mtime"] == st.st_mtime_ns and cache["gen"] == gen:
+            return cache["dentists"], mtime
 
         # Recompute from DB
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            cur = conn.cursor()
-            cur.execute("PRAGMA table_info(users)")
-            cols = [row[1] for row in cur.fetchall()]
-            if "id" not in cols:
+        with users_engine.connect() as conn:
+            _name_col, color_col, select_sql = _users_schema(conn, db_path, st.st_mtime_ns)
+            if select_sql is None:
                 dentists: list[dict] = []
             else:
-                name_candidates = [
-                    "nome_profissional",
-                    "nome",
-                    "name",
-                    "full_name",
-                    "username",
-                ]
-                name_col = next((c for c in name_candidates if c in cols), None)
-                if not name_col:
-                    name_col = "id"
-                color_col = "color" if "color" in cols else ("cor" if "cor" in cols else None)
-                sel_cols = [
-                    "id",
-                    name_col,
-                ] + ([color_col] if color_col else [])
-                q = f"SELECT {', '.join(sel_cols)} FROM users " f"ORDER BY {name_col}"
-                cur.execute(q)
-                rows = cur.fetchall()
+                rows = conn.exec_driver_sql(select_sql).fetchall()
                 dentists = []
                 for r in rows:
-                    did = r["id"]
-                    name = r[name_col]
-                    color_val = r[color_col] if color_col else None
+                    did = r[0]
+                    name = r[1]
+                    color_val = r[2] if color_col else None
                     dentists.append({"id": did, "nome": name, "color": color_val})
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
         setattr(
             _load_dentists_list_cached,
             "_cache",
-            {"dentists": dentists, "mtime": mtime, "at": now},
+            {"dentists": dentists, "mtime": st.st_mtime_ns, "gen": gen},
         )
         return dentists, mtime
     except Exception:
         return [], 0.0
 
 
-# Holidays caches
-_HOLIDAYS_YEAR_CACHE: dict[int, dict] = {}
-_HOLIDAYS_RANGE_CACHE: dict[tuple[str, str], dict] = {}
+# Caches (feriados via lru_cache; dentistas em atributos das funções) levam
+# a geração atual na chave. Invalidar = incrementar a geração, sem .clear()
+# concorrente com quem está lendo (rebinding é atômico no GIL).
 _HOLIDAYS_TTL_SECONDS = 3600  # 1h
+_HOLIDAYS_GEN = 0
+_DENTISTS_GEN = 0
+_EVENTS_PROF_GEN = 0
 
 
 def _invalidate_holidays_cache() -> None:
-    _HOLIDAYS_YEAR_CACHE.clear()
-    _HOLIDAYS_RANGE_CACHE.clear()
+    global _HOLIDAYS_GEN
+    _HOLIDAYS_GEN += 1
 
 
 def _invalidate_dentists_caches() -> None:
     """Invalidate dentists-related in-memory caches."""
-    try:
-        if hasattr(_load_dentists_list_cached, "_cache"):
-            delattr(_load_dentists_list_cached, "_cache")
-    except Exception:
-        pass
-    try:
-        if hasattr(_load_valid_dentist_ids, "_cache"):
-            delattr(_load_valid_dentist_ids, "_cache")
-    except Exception:
-        pass
+    global _DENTISTS_GEN
+    _DENTISTS_GEN += 1
+
+
+def _invalidate_orphan_prof_ids() -> None:
+    """Chamar após inserir/excluir evento ou alterar profissional_id."""
+    global _EVENTS_PROF_GEN
+    _EVENTS_PROF_GEN += 1
 
 
 @app.route("/cache/clear", methods=["POST"])
@@ -345,6 +512,16 @@ def _try_parse(fmt: str, s: str):
         return None
 
 
+# Formato por quantidade de ":" (0 = só data, 1 = HH:MM, 2 = HH:MM:SS);
+# escolher o formato antes evita uma cascata de strptime/ValueError.
+_BR_FORMATS = ("%d/%m/%Y", "%d/%m/%Y %H:%M", "%d/%m/%Y %H:%M:%S")
+_ISO_FORMATS = (
+    ("%Y-%m-%d",),
+    ("%Y-%m-%dT%H:%M", "%Y-%m-%d %H:%M"),
+    ("%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"),
+)
+
+
 def parse_input_datetime(raw: str):
     """Aceita valores em pt-BR e ISO.
     Retorna (dt, is_date_only) ou (None, None).
@@ -352,34 +529,28 @@ def parse_input_datetime(raw: str):
     if not raw:
         return None, None
     s = str(raw).strip()
-    # pt-BR com hora
-    for fmt in ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M"):
-        dt = _try_parse(fmt, s)
-        if dt:
-            return dt, False
-    # pt-BR só data
-    dt = _try_parse("%d/%m/%Y", s)
-    if dt:
-        return dt, True
-    # ISO com hora
-    for fmt in (
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%dT%H:%M",
-        "%Y-%m-%d %H:%M",
-    ):
-        dt = _try_parse(fmt, s)
-        if dt:
-            return dt, False
-    # ISO só data
-    dt = _try_parse("%Y-%m-%d", s)
-    if dt:
-        return dt, True
+    colons = s.count(":")
+    if "/" in s[:10]:
+        # pt-BR (com ou sem hora)
+        if colons <= 2:
+            dt = _try_parse(_BR_FORMATS[colons], s)
+            if dt:
+                return dt, colons == 0
+    elif s:
+        # ISO: fromisoformat é bem mais rápido que strptime
+        try:
+            return datetime.fromisoformat(s), len(s) == 10
+        except ValueError:
+            pass
+        # ISO sem zero à esquerda (ex.: 2025-1-2 9:00)
+        if colons <= 2:
+            for fmt in _ISO_FORMATS[colons]:
+                dt = _try_parse(fmt, s)
+                if dt:
+                    return dt, colons == 0
     # Fallback: dateutil com dayfirst
     try:
-        from dateutil.parser import parse as du_parse
-
-        dt = du_parse(s, dayfirst=True)
+        dt = _du_parse(s, dayfirst=True)
         # Heurística: se string tem apenas dígitos/sep e tamanho 10,
         # considerar date-only
         is_date_only = len(s) == 10 and s.count("/") + s.count("-") in (2,)
@@ -397,154 +568,257 @@ def normalize_for_storage(dt: datetime, is_date_only: bool) -> str:
     return dt.strftime("%Y-%m-%d") if is_date_only else dt.strftime("%Y-%m-%dT%H:%M:%S")
 
 
+def _is_all_day_stored(start: str, end: str) -> bool:
+    """allDay a partir das strings já normalizadas, sem parsing de data.
+
+    Equivale à regra de to_dict para os formatos de normalize_for_storage:
+    só data, ou início e fim à meia-noite (diferença sempre em dias inteiros).
+    """
+    return start[10:] in ("", "T00:00:00") and end[10:] in ("", "T00:00:00")
+
+
+def _event_rows_to_dicts(events) -> list[dict]:
+    out = []
+    for e in events:
+        s, en = e.start, e.end
+        out.append(
+            {
+                "id": e.id,
+                "title": e.title,
+                "start": s,
+                "end": en,
+                "color": e.color,
+                "notes": e.notes,
+                "allDay": _is_all_day_stored(s or "", en or ""),
+                "profissional_id": e.profissional_id,
+            }
+        )
+    return out
+
+
+# Mapeamento de palavras -> hex (paleta do menu de cores)
+COLOR_WORDS: MappingProxyType = MappingProxyType(
+    {
+        "vermelho": ("#e11d48",),
+        "rosa": ("#f43f5e", "#f472b6"),
+        "rosa-claro": ("#f472b6",),
+        "laranja": ("#f59e42",),
+        "amarelo": ("#fbbf24",),
+        "verde": ("#22c55e",),
+        "verde-agua": ("#10b981",),
+        "verde agua": ("#10b981",),
+        "azul": ("#2563eb",),
+        "azul-escuro": ("#2563eb",),
+        "azul escuro": ("#2563eb",),
+        "azul-claro": ("#0ea5e9",),
+        "azul claro": ("#0ea5e9",),
+        "roxo": ("#6366f1",),
+        "lilás": ("#6366f1",),
+        "lilas": ("#6366f1",),
+        "roxo-escuro": ("#a21caf",),
+        "roxo escuro": ("#a21caf",),
+        "púrpura": ("#a21caf",),
+        "purpura": ("#a21caf",),
+        "cinza": ("#64748b",),
+        "grey": ("#64748b",),
+        "grafite": ("#64748b",),
+    }
+)
+_HEX_COLOR_MATCH = re.compile(r"#([0-9a-f]{3}|[0-9a-f]{6})").fullmatch
+
+
+def _scan_color_words(q: str) -> list[str]:
+    # busca por substring (ex.: "consulta azul" -> azul); únicos, em ordem
+    hexes: dict[str, None] = {}
+    for word, values in COLOR_WORDS.items():
+        if word in q:
+            hexes.update(dict.fromkeys(values))
+    return list(hexes)
+
+
+# Resultado pré-computado quando a busca é exatamente uma palavra de cor
+# (inclui as palavras contidas nela, ex.: "rosa-claro" também casa "rosa")
+_COLOR_EXACT: dict[str, tuple[str, ...]] = {w: tuple(_scan_color_words(w)) for w in COLOR_WORDS}
+
+
 def _color_hexes_for_query(query_text: str) -> list[str]:
     q = (query_text or "").strip().lower()
     if not q:
         return []
-    # Mapeamento de palavras -> hex (paleta do menu de cores)
-    COLOR_WORDS: dict[str, list[str]] = {
-        "vermelho": ["#e11d48"],
-        "rosa": ["#f43f5e", "#f472b6"],
-        "rosa-claro": ["#f472b6"],
-        "laranja": ["#f59e42"],
-        "amarelo": ["#fbbf24"],
-        "verde": ["#22c55e"],
-        "verde-agua": ["#10b981"],
-        "verde agua": ["#10b981"],
-        "azul": ["#2563eb"],
-        "azul-escuro": ["#2563eb"],
-        "azul escuro": ["#2563eb"],
-        "azul-claro": ["#0ea5e9"],
-        "azul claro": ["#0ea5e9"],
-        "roxo": ["#6366f1"],
-        "lilás": ["#6366f1"],
-        "lilas": ["#6366f1"],
-        "roxo-escuro": ["#a21caf"],
-        "roxo escuro": ["#a21caf"],
-        "púrpura": ["#a21caf"],
-        "purpura": ["#a21caf"],
-        "cinza": ["#64748b"],
-        "grey": ["#64748b"],
-        "grafite": ["#64748b"],
-    }
-    hexes: list[str] = []
-    for word, values in COLOR_WORDS.items():
-        if q == word or word in q:
-            hexes.extend(values)
-    # aceitar busca por hex direto (#rrggbb)
-    if q.startswith("#") and len(q) in (4, 7):
+    hit = _COLOR_EXACT.get(q)
+    if hit is not None:
+        return list(hit)
+    hexes = _scan_color_words(q)
+    # aceitar busca por hex direto (#rgb / #rrggbb)
+    if _HEX_COLOR_MATCH(q) and q not in hexes:
         hexes.append(q)
-    # normalizar únicos
-    seen = set()
-    uniq = []
-    for h in hexes:
-        if h not in seen:
-            seen.add(h)
-            uniq.append(h)
-    return uniq
-
-
-def _apply_query_filters(base_query, query_text: str):
-    qtxt = (query_text or "").strip().lower()
-    if not qtxt:
-        return base_query
-    like = f"%{qtxt}%"
-    col_title = getattr(CalendarEvent, "title")
-    col_notes = getattr(CalendarEvent, "notes")
-    title_match = col_title.ilike(like)
-    notes_match = col_notes.ilike(like)
-    color_hexes = _color_hexes_for_query(qtxt)
-    if color_hexes:
-        col_color = getattr(CalendarEvent, "color")
-        color_match = col_color.in_(color_hexes)
-        return base_query.filter(or_(title_match, notes_match, color_match))
-    return base_query.filter(or_(title_match, notes_match))
+    return hexes
+
+
+# Cláusulas WHERE montadas uma única vez, com bindparams nomeados: a forma
+# do SELECT só depende de quais filtros estão ativos, então o cache de SQL
+# compilado do SQLAlchemy é reaproveitado (IN com expanding=True aceita
+# listas de qualquer tamanho sem recompilar).
+_EVENT_FILTERS = {
+    "pids": CalendarEvent.profissional_id.in_(bindparam("pids", expanding=True)),
+    "pids_or_unassigned": or_(
+        CalendarEvent.profissional_id.in_(bindparam("pids", expanding=True)),
+        CalendarEvent.profissional_id.is_(None),
+    ),
+    "unassigned": CalendarEvent.profissional_id.is_(None),
+    "orphans": CalendarEvent.profissional_id.in_(bindparam("orphan_ids", expanding=True)),
+    # intersecção com o range: event.end >= start AND event.start < end
+    "range": and_(
+        CalendarEvent.end >= bindparam("range_start"),
+        CalendarEvent.start < bindparam("range_end"),
+    ),
+    "text": or_(
+        CalendarEvent.title.ilike(bindparam("like")),
+        CalendarEvent.notes.ilike(bindparam("like")),
+    ),
+    "text_color": or_(
+        CalendarEvent.title.ilike(bindparam("like")),
+        CalendarEvent.notes.ilike(bindparam("like")),
+        CalendarEvent.color.in_(bindparam("colors", expanding=True)),
+    ),
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _events_stmt(kind: str, keys: tuple[str, ...]):
+    """SELECT de /events ("list"/"list_noprof"), /events/search_range
+    ("range") ou do ETag ("meta") com os filtros nomeados em keys."""
+    if kind == "meta":
+        stmt = select(func.max(CalendarEvent.updated_at), func.count())
+    elif kind == "range":
+        # Agregação feita no banco: como usamos formato ISO no armazenamento,
+        # MIN/MAX lexical equivale ao cronológico
+        stmt = select(
+            func.min(CalendarEvent.start),
+            func.max(CalendarEvent.end),
+            func.count(),
+        )
+    elif kind == "list_noprof":
+        stmt = select(*_EVENT_COLS[:-1], literal(None).label("profissional_id"))
+    else:
+        # Somente as colunas serializadas: sem hidratar objetos ORM
+        stmt = select(*_EVENT_COLS)
+    return stmt.where(*(_EVENT_FILTERS[k] for k in keys))
 
 
-@app.route("/events")
-def get_events():
-    # Optional range filtering from FullCalendar: start/end (ISO).
-    # End is exclusive.
-    range_start = (request.args.get("start") or "").strip()
-    range_end = (request.args.get("end") or "").strip()
-    q = CalendarEvent.query
-    # Server-side search (title, notes, color by word)
-    query_text = (request.args.get("q") or "").strip()
+def _build_events_filters(q_args, use_range: bool = True) -> tuple[tuple[str, ...], dict]:
+    """Escolhe os filtros comuns a /events e /events/search_range.
+
+    Params lidos: q, dentists, include_unassigned e (se use_range) start/end.
+    O range é ignorado quando há busca (q), para retornar todos os resultados.
+    Retorna (chaves de _EVENT_FILTERS, parâmetros de bind).
+    """
+    keys: list[str] = []
+    params: dict = {}
+    query_text = (q_args.get("q") or "").strip()
     # Filtrar por dentistas selecionados (CSV de ids inteiros)
-    dentists_param = (request.args.get("dentists") or "").strip()
-    include_unassigned = (request.args.get("include_unassigned") or "").strip() in (
+    dentists_param = (q_args.get("dentists") or "").strip()
+    include_unassigned = (q_args.get("include_unassigned") or "").strip() in (
         "1",
         "true",
         "True",
     )
     if dentists_param:
-        try:
-            ids = [int(x) for x in dentists_param.split(",") if x.strip().isdigit()]
-            col_prof = getattr(CalendarEvent, "profissional_id")
-            if ids and include_unassigned:
-                q = q.filter(or_(col_prof.in_(ids), col_prof.is_(None)))
-            elif ids:
-                q = q.filter(col_prof.in_(ids))
-        except Exception:
-            pass
+        ids = _parse_id_csv(dentists_param)
+        if ids:
+            keys.append("pids_or_unassigned" if include_unassigned else "pids")
+            params["pids"] = list(ids)
+    elif include_unassigned:
+        # Somente "Todos (sem dentista)" selecionado:
+        # retornar apenas sem dentista
+        keys.append("unassigned")
     else:
-        # Sem ids selecionados
-        try:
-            col_prof = getattr(CalendarEvent, "profissional_id")
-            if include_unassigned:
-                # Somente "Todos (sem dentista)" selecionado:
-                # retornar apenas sem dentista
-                q = q.filter(col_prof.is_(None))
-            else:
-                # Nenhuma opção marcada:
-                # apenas inválidos (ignora sem dentista)
-                valid_ids = _load_valid_dentist_ids()
-                q = q.filter(col_prof.is_not(None))
-                if valid_ids:
-                    q = q.filter(~col_prof.in_(list(valid_ids)))
-        except Exception:
-            # Se a coluna não existir, manter comportamento padrão (sem filtro)
-            pass
-    # When both start and end present, restrict to events that
-    # intersect the range: event.end >= start AND event.start < end
-    # Se houver busca (q), ignore range para retornar todos os resultados
-    if range_start and range_end and not query_text:
-        try:
-            # basic sanity check on formats
-            # accept YYYY-MM-DD or YYYY-MM-DDTHH:MM[:SS]
-            if len(range_start) >= 10 and len(range_end) >= 10:
-                col_end = getattr(CalendarEvent, "end")
-                col_start = getattr(CalendarEvent, "start")
-                q = q.filter(col_end >= range_start)
-                q = q.filter(col_start < range_end)
-        except Exception:
-            # fallback to full list if parsing fails
-            pass
+        # Nenhuma opção marcada:
+        # apenas inválidos (ignora sem dentista)
+        keys.append("orphans")
+        params["orphan_ids"] = list(_orphan_prof_ids())
+    if use_range and not query_text:
+        range_params = _range_params(q_args)
+        if range_params:
+            keys.append("range")
+            params.update(range_params)
     # Aplicar busca por título/notas/cor
-    if query_text:
-        q = _apply_query_filters(q, query_text)
+    qtxt = query_text.lower()
+    if qtxt:
+        params["like"] = f"%{qtxt}%"
+        color_hexes = _color_hexes_for_query(qtxt)
+        if color_hexes:
+            keys.append("text_color")
+            params["colors"] = color_hexes
+        else:
+            keys.append("text")
+    return tuple(keys), params
+
+
+def _events_etag(keys: tuple[str, ...], params: dict) -> str | None:
+    """ETag "<max(updated_at)>:<count>" do conjunto filtrado; None se o
+    banco ainda não tem a coluna updated_at."""
     try:
-        events = q.all()
-        return jsonify([event.to_dict() for event in events])
+        max_updated, count = db.session.execute(_events_stmt("meta", keys), params).one()
+    except Exception:
+        db.session.rollback()
+        return None
+    stamp = max_updated.timestamp() if max_updated else 0
+    return f'"{stamp:.6f}:{count}"'
+
+
+def _etag_headers(etag: str | None) -> dict:
+    if etag is None:
+        return {}
+    return {"Cache-Control": "private, max-age=30", "ETag": etag}
+
+
+@functools.lru_cache(maxsize=256)
+def _parse_id_csv(raw: str) -> tuple[int, ...]:
+    """CSV de ids inteiros -> tupla sem duplicatas (ordem preservada)."""
+    return tuple(dict.fromkeys(int(x) for x in raw.split(",") if x.strip().isdigit()))
+
+
+def _parse_profissional_id(value) -> int | None:
+    if value is None:
+        return None
+    raw = str(value).strip()
+    return int(raw) if raw.isdigit() else None
+
+
+def _range_params(q_args) -> dict | None:
+    # accept YYYY-MM-DD or YYYY-MM-DDTHH:MM[:SS]; End is exclusive.
+    range_start = (q_args.get("start") or "").strip()
+    range_end = (q_args.get("end") or "").strip()
+    if len(range_start) >= 10 and len(range_end) >= 10:
+        return {"range_start": range_start, "range_end": range_end}
+    return None
+
+
+@app.route("/events")
+def get_events():
+    # Optional range filtering from FullCalendar: start/end (ISO).
+    keys, params = _build_events_filters(request.args)
+    etag = _events_etag(keys, params)
+    headers = _etag_headers(etag)
+    if etag and request.headers.get("If-None-Match") == etag:
+        # curto-circuito 304: sem consulta completa nem serialização
+        return "", 304, headers
+    try:
+        events = db.session.execute(_events_stmt("list", keys), params).all()
+        return _json_response(_event_rows_to_dicts(events)), 200, headers
     except Exception as e:
         # Fallback: se a coluna 'profissional_id' não existe,
         # refazer sem filtro
         msg = str(e).lower()
         if "no such column" in msg and "profissional_id" in msg:
             try:
-                q2 = CalendarEvent.query
+                db.session.rollback()
                 # manter apenas o filtro de data, se houver
-                if range_start and range_end:
-                    try:
-                        if len(range_start) >= 10 and len(range_end) >= 10:
-                            col_end = getattr(CalendarEvent, "end")
-                            col_start = getattr(CalendarEvent, "start")
-                            q2 = q2.filter(col_end >= range_start)
-                            q2 = q2.filter(col_start < range_end)
-                    except Exception:
-                        pass
-                events = q2.all()
-                return jsonify([event.to_dict() for event in events])
+                range_params = _range_params(request.args)
+                stmt = _events_stmt("list_noprof", ("range",) if range_params else ())
+                events = db.session.execute(stmt, range_params or {}).all()
+                return _json_response(_event_rows_to_dicts(events))
             except Exception:
                 return jsonify([])
         # Outro erro inesperado
@@ -557,60 +831,15 @@ def events_search_range():
     filtros atuais, ignorando o range da visão.
     Params: q, dentists, include_unassigned.
     """
-    q = CalendarEvent.query
-    # filtros de dentista
-    dentists_param = (request.args.get("dentists") or "").strip()
-    include_unassigned = (request.args.get("include_unassigned") or "").strip() in (
-        "1",
-        "true",
-        "True",
-    )
-    if dentists_param:
-        try:
-            ids = [int(x) for x in dentists_param.split(",") if x.strip().isdigit()]
-            col_prof = getattr(CalendarEvent, "profissional_id")
-            if ids and include_unassigned:
-                q = q.filter(or_(col_prof.in_(ids), col_prof.is_(None)))
-            elif ids:
-                q = q.filter(col_prof.in_(ids))
-        except Exception:
-            pass
-    else:
-        # Sem ids selecionados
-        try:
-            col_prof = getattr(CalendarEvent, "profissional_id")
-            if include_unassigned:
-                # Somente "Todos (sem dentista)" selecionado:
-                # somente sem dentista
-                q = q.filter(col_prof.is_(None))
-            else:
-                # Nenhuma opção marcada => apenas inválidos
-                valid_ids = _load_valid_dentist_ids()
-                q = q.filter(col_prof.is_not(None))
-                if valid_ids:
-                    q = q.filter(~col_prof.in_(list(valid_ids)))
-        except Exception:
-            pass
-    # aplicar q
-    query_text = (request.args.get("q") or "").strip()
-    if query_text:
-        q = _apply_query_filters(q, query_text)
+    keys, params = _build_events_filters(request.args, use_range=False)
+    etag = _events_etag(keys, params)
+    headers = _etag_headers(etag)
+    if etag and request.headers.get("If-None-Match") == etag:
+        return "", 304, headers
     try:
-        events = q.all()
-        if not events:
-            return jsonify({"min": None, "max": None, "count": 0})
-        # Como usamos formato ISO no armazenamento, comparação lexical funciona
-        starts = [e.start for e in events if e.start]
-        ends = [e.end for e in events if e.end]
-        min_start = min(starts) if starts else None
-        max_end = max(ends) if ends else None
-        return jsonify(
-            {
-                "min": min_start,
-                "max": max_end,
-                "count": len(events),
-            }
-        )
+        row = db.session.execute(_events_stmt("range", keys), params).one()
+        payload = {"min": row[0], "max": row[1], "count": row[2] or 0}
+        return _json_response(payload), 200, headers
     except Exception:
         return jsonify({"min": None, "max": None, "count": 0})
 
@@ -654,14 +883,11 @@ def add_event():
         end=new_end,
         color=data.get("color"),
         notes=data.get("notes"),
-        profissional_id=(
-            int(data.get("profissional_id"))
-            if str(data.get("profissional_id" or "")).isdigit()
-            else None
-        ),
+        profissional_id=_parse_profissional_id(data.get("profissional_id")),
     )
     db.session.add(new_event)
     db.session.commit()
+    _invalidate_orphan_prof_ids()
     return jsonify({"status": "success", "event": new_event.to_dict()})
 
 
@@ -670,13 +896,12 @@ def add_event():
 def delete_event():
     data = request.get_json()
     event_id = data.get("id")
-    event = db.session.get(CalendarEvent, event_id)
-    if event:
-        db.session.delete(event)
-        db.session.commit()
-        return jsonify({"status": "success"})
-    else:
+    res = db.session.execute(delete(CalendarEvent).where(CalendarEvent.id == event_id))
+    db.session.commit()
+    _invalidate_orphan_prof_ids()
+    if res.rowcount == 0:
         return jsonify({"status": "error", "message": "Event not found"}), 404
+    return jsonify({"status": "success"})
 
 
 # Endpoint to update event (date/time)
@@ -687,41 +912,39 @@ def update_event():
     raw_start = data.get("start")
     raw_end = data.get("end")
 
-    event = db.session.get(CalendarEvent, event_id)
-    if event:
-        start_dt, start_is_date_only = (
-            parse_input_datetime(raw_start) if raw_start else (None, None)
-        )
-        end_dt, end_is_date_only = parse_input_datetime(raw_end) if raw_end else (None, None)
+    # Campos alterados reunidos num único UPDATE (sem carregar a linha)
+    changed: dict = {}
+    start_dt, start_is_date_only = parse_input_datetime(raw_start) if raw_start else (None, None)
+    end_dt, end_is_date_only = parse_input_datetime(raw_end) if raw_end else (None, None)
 
-        if start_dt:
-            if start_is_date_only:
-                if not end_dt or not end_is_date_only or end_dt <= start_dt:
-                    end_dt = start_dt + timedelta(days=1)
-                    end_is_date_only = True
-            else:
-                if not end_dt or end_dt <= start_dt:
-                    end_dt = start_dt + timedelta(hours=1)
-                    end_is_date_only = False
-            # Garantir tipos booleanos
-            start_is_date_only = bool(start_is_date_only)
-            end_is_date_only = bool(end_is_date_only)
-            event.start = normalize_for_storage(start_dt, start_is_date_only)
-            if end_dt:
-                event.end = normalize_for_storage(end_dt, end_is_date_only)
-            else:
-                event.end = None
-        # Atualização opcional do dentista
-        try:
-            if "profissional_id" in data:
-                pid = data.get("profissional_id")
-                event.profissional_id = int(pid) if str(pid).isdigit() else None
-        except Exception:
-            pass
-        db.session.commit()
-        return jsonify({"status": "success"})
-    else:
+    if start_dt:
+        if start_is_date_only:
+            if not end_dt or not end_is_date_only or end_dt <= start_dt:
+                end_dt = start_dt + timedelta(days=1)
+                end_is_date_only = True
+        else:
+            if not end_dt or end_dt <= start_dt:
+                end_dt = start_dt + timedelta(hours=1)
+                end_is_date_only = False
+        # Garantir tipos booleanos
+        start_is_date_only = bool(start_is_date_only)
+        end_is_date_only = bool(end_is_date_only)
+        changed["start"] = normalize_for_storage(start_dt, start_is_date_only)
+        changed["end"] = normalize_for_storage(end_dt, end_is_date_only)
+    # Atualização opcional do dentista
+    if "profissional_id" in data:
+        pid = data.get("profissional_id")
+        changed["profissional_id"] = _parse_profissional_id(pid)
+    changed["updated_at"] = _utcnow()
+    res = db.session.execute(
+        update(CalendarEvent).where(CalendarEvent.id == event_id).values(**changed)
+    )
+    db.session.commit()
+    if "profissional_id" in changed:
+        _invalidate_orphan_prof_ids()
+    if res.rowcount == 0:
         return jsonify({"status": "error", "message": "Event not found"}), 404
+    return jsonify({"status": "success"})
 
 
 # Endpoint to update event color
@@ -730,13 +953,13 @@ def update_event_color():
     data = request.get_json()
     event_id = data.get("id")
     color = data.get("color")
-    event = db.session.get(CalendarEvent, event_id)
-    if event:
-        event.color = color
-        db.session.commit()
-        return jsonify({"status": "success", "color": color})
-    else:
+    res = db.session.execute(
+        update(CalendarEvent).where(CalendarEvent.id == event_id).values(color=color)
+    )
+    db.session.commit()
+    if res.rowcount == 0:
         return jsonify({"status": "error", "message": "Event not found"}), 404
+    return jsonify({"status": "success", "color": color})
 
 
 # Endpoint to update event notes (description)
@@ -745,13 +968,13 @@ def update_event_notes():
     data = request.get_json()
     event_id = data.get("id")
     notes = data.get("notes", "")
-    event = db.session.get(CalendarEvent, event_id)
-    if event:
-        event.notes = notes
-        db.session.commit()
-        return jsonify({"status": "success", "notes": notes})
-    else:
+    res = db.session.execute(
+        update(CalendarEvent).where(CalendarEvent.id == event_id).values(notes=notes)
+    )
+    db.session.commit()
+    if res.rowcount == 0:
         return jsonify({"status": "error", "message": "Event not found"}), 404
+    return jsonify({"status": "success", "notes": notes})
 
 
 # ===== Dentists (users.db) =====
@@ -771,7 +994,7 @@ def listar_dentistas():
     if inm and inm == etag:
         # curto-circuito 304
         return "", 304, headers
-    resp = jsonify(dentists)
+    resp = _json_response(dentists)
     for k, v in headers.items():
         resp.headers[k] = v
     return resp
@@ -781,12 +1004,11 @@ def listar_dentistas():
 @app.route("/pacientes")
 def listar_pacientes():
     """Retorna lista de pacientes do banco pacientes.db"""
-    engine = create_engine("sqlite:///instance/pacientes.db")
-    with engine.connect() as conn:
+    with pacientes_engine.connect() as conn:
         query = "SELECT id, nome FROM pacientes ORDER BY nome"
-        result = conn.execute(text(query))
+        result = conn.exec_driver_sql(query)
         pacientes = [{"id": row[0], "nome": row[1]} for row in result]
-    return jsonify(pacientes)
+    return _json_response(pacientes)
 
 
 # Endpoint para buscar nomes de pacientes para autocompletar
@@ -802,24 +1024,34 @@ def buscar_nomes():
         # Padrões: início do nome (q%) OU após espaço (" q%")
         # Utiliza NOCASE para ignorar maiúsculas/minúsculas
         try:
-            conn = sqlite3.connect("instance/pacientes.db")
-            cursor = conn.cursor()
-            cursor.execute(
-                "SELECT nome FROM pacientes "
-                "WHERE (nome LIKE ? COLLATE NOCASE) "
-                "   OR (nome LIKE ? COLLATE NOCASE) "
-                "ORDER BY nome LIMIT 20",
-                (f"{query}%", f"% {query}%"),
-            )
-            for row in cursor.fetchall():
-                if row[0]:
-                    nomes.append(row[0])
-            conn.close()
+            with pacientes_engine.connect() as conn:
+                try:
+                    # Índice FTS5: prefixo em qualquer palavra do nome
+                    # (cobre os dois padrões LIKE abaixo) sem varrer a tabela.
+                    fts_query = '"' + query.replace('"', '""') + '"*'
+                    rows = conn.exec_driver_sql(
+                        "SELECT nome FROM pacientes_fts "
+                        "WHERE pacientes_fts MATCH ? "
+                        "ORDER BY rank LIMIT 20",
+                        (fts_query,),
+                    ).fetchall()
+                except Exception:
+                    # FTS5 indisponível (ou tabela ainda não criada): LIKE
+                    rows = conn.exec_driver_sql(
+                        "SELECT nome FROM pacientes "
+                        "WHERE (nome LIKE ? COLLATE NOCASE) "
+                        "   OR (nome LIKE ? COLLATE NOCASE) "
+                        "ORDER BY nome LIMIT 20",
+                        (f"{query}%", f"% {query}%"),
+                    ).fetchall()
+                for row in rows:
+                    if row[0]:
+                        nomes.append(row[0])
         except Exception as e:
             print(f"Erro ao buscar pacientes: {e}")
 
     # Limitar o total de resultados
-    return jsonify(nomes[:20])
+    return _json_response(nomes[:20])
 
 
 # Endpoint para buscar telefone do paciente pelo nome
@@ -832,25 +1064,19 @@ def buscar_telefone():
         return jsonify({"telefone": None})
 
     try:
-        conn = sqlite3.connect("instance/pacientes.db")
-        cursor = conn.cursor()
-
-        # Buscar primeiro por nome exato
-        cursor.execute(
-            ("SELECT celular FROM pacientes " "WHERE LOWER(nome) = LOWER(?) LIMIT 1"),
-            (nome,),
-        )
-        result = cursor.fetchone()
-
-        # Se não encontrou, buscar por nome que contenha o termo
-        if not result:
-            cursor.execute(
-                "SELECT celular FROM pacientes WHERE LOWER(nome) LIKE " "LOWER(?) LIMIT 1",
-                (f"%{nome}%",),
-            )
-            result = cursor.fetchone()
-
-        conn.close()
+        with pacientes_engine.connect() as conn:
+            # Buscar primeiro por nome exato
+            result = conn.exec_driver_sql(
+                ("SELECT celular FROM pacientes " "WHERE LOWER(nome) = LOWER(?) LIMIT 1"),
+                (nome,),
+            ).fetchone()
+
+            # Se não encontrou, buscar por nome que contenha o termo
+            if not result:
+                result = conn.exec_driver_sql(
+                    "SELECT celular FROM pacientes WHERE LOWER(nome) LIKE " "LOWER(?) LIMIT 1",
+                    (f"%{nome}%",),
+                ).fetchone()
 
         if result and result[0]:
             return jsonify({"telefone": result[0]})
@@ -877,23 +1103,59 @@ def invertexto_token():
     DELETE: clears the stored token.
     """
     if request.method == "GET":
-        tok = get_setting("invertexto_token")
+        tok, _ = _invertexto_auth()
         return jsonify({"hasToken": bool(tok)})
     if request.method == "DELETE":
         delete_setting("invertexto_token")
+        _set_token_cache(None)
         return jsonify({"status": "success"})
     data = request.get_json(silent=True) or {}
     token = (data.get("token") or "").strip()
     if not token:
         return jsonify({"status": "error", "message": "Token vazio"}), 400
     set_setting("invertexto_token", token)
+    _set_token_cache(token)
     return jsonify({"status": "success"})
 
 
+def _holiday_str(value) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _holiday_rows(items: list, year: int, state: str | None) -> list[dict]:
+    """Valida os itens da API Invertexto e monta as linhas de holidays.
+    Itens sem data ou nome (ou que não sejam objetos) são ignorados e datas
+    repetidas (ex.: feriado nacional e estadual no mesmo dia) mantêm só a
+    primeira ocorrência, evitando conflito de PK no executemany."""
+    seen: set[str] = set()
+    rows = []
+    for it in items:
+        if not isinstance(it, dict) or "date" not in it or "name" not in it:
+            continue
+        date = str(it["date"] or "").strip()  # YYYY-MM-DD
+        name = _holiday_str(it["name"])
+        if not date or not name or date in seen:
+            continue
+        seen.add(date)
+        rows.append(
+            {
+                "date": date,
+                "name": name,
+                "type": _holiday_str(it.get("type")) or None,
+                "level": _holiday_str(it.get("level")) or None,
+                "state": state,
+                "year": year,
+                "source": "invertexto",
+            }
+        )
+    return rows
+
+
 @app.route("/holidays/refresh", methods=["POST"])
 def holidays_refresh():
-    """Fetch holidays from Invertexto for a given year and optional state (UF),
-    then upsert into local DB. Body: { year: 2025, state?: 'SP' }"""
+    """Enqueue a refresh of holidays from Invertexto for a given year and
+    optional state (UF). Body: { year: 2025, state?: 'SP' }.
+    Returns 202 with task_id; poll /holidays/refresh/status/<task_id>."""
     if requests is None:
         return (
             jsonify(
@@ -909,7 +1171,7 @@ def holidays_refresh():
     state = (data.get("state") or "").strip().upper() or None
     if year <= 0:
         return jsonify({"status": "error", "message": "Ano inválido"}), 400
-    token = get_setting("invertexto_token")
+    token, headers = _invertexto_auth()
     if not token:
         return (
             jsonify(
@@ -920,13 +1182,61 @@ def holidays_refresh():
             ),
             400,
         )
+    task_id = uuid.uuid4().hex
+    _REFRESH_TASKS[task_id] = {"status": "queued"}
+    _REFRESH_EXECUTOR.submit(_run_holidays_refresh_task, task_id, year, state, token, headers)
+    return (
+        jsonify(
+            {
+                "status": "queued",
+                "task_id": task_id,
+                "status_url": f"/holidays/refresh/status/{task_id}",
+            }
+        ),
+        202,
+    )
+
+
+@app.route("/holidays/refresh/status/<task_id>")
+def holidays_refresh_status(task_id: str):
+    """Estado de um refresh enfileirado: queued | running | success | error."""
+    task = _REFRESH_TASKS.get(task_id)
+    if task is None:
+        return jsonify({"status": "error", "message": "Tarefa não encontrada"}), 404
+    return jsonify(task)
+
+
+# Refresh de feriados fora da thread da requisição: a chamada HTTP (até 15s)
+# não prende um worker. Um único worker serializa refreshes concorrentes.
+_REFRESH_EXECUTOR = ThreadPoolExecutor(max_workers=1, thread_name_prefix="holidays")
+_REFRESH_TASKS: dict[str, dict] = {}
+_REFRESH_TASKS_MAX = 50
+
+
+def _run_holidays_refresh_task(
+    task_id: str, year: int, state: str | None, token: str, headers: dict
+):
+    _REFRESH_TASKS[task_id] = {"status": "running"}
+    try:
+        with app.app_context():
+            result = _do_holidays_refresh(year, state, token, headers)
+    except Exception as e:
+        result = {"status": "error", "message": f"Falha inesperada: {e}"}
+    _REFRESH_TASKS[task_id] = result
+    # manter só os resultados mais recentes (dict preserva a ordem de inserção)
+    while len(_REFRESH_TASKS) > _REFRESH_TASKS_MAX:
+        _REFRESH_TASKS.pop(next(iter(_REFRESH_TASKS)), None)
+
+
+def _do_holidays_refresh(year: int, state: str | None, token: str, headers: dict) -> dict:
+    """Busca os feriados na Invertexto e substitui os do ano no banco.
+    Retorna o payload final da tarefa (status success/error)."""
     url = f"https://api.invertexto.com/v1/holidays/{year}"
     params = {"token": token}
     if state:
         params["state"] = state
     try:
-        headers = {"Authorization": f"Bearer {token}"}
-        r = requests.get(url, params=params, headers=headers, timeout=15)
+        r = _HTTP.get(url, params=params, headers=headers, timeout=15)
         if r.status_code != 200:
             msg = f"Erro {r.status_code} da API Invertexto"
             if r.status_code == 401:
@@ -935,76 +1245,107 @@ def holidays_refresh():
                 msg = "Parâmetros inválidos (400): ano/UF"
             elif r.status_code == 429:
                 msg = "Limite de requisições excedido (429)"
-            return jsonify({"status": "error", "message": msg}), 502
-        items = r.json() if r.content else []
+            return {"status": "error", "message": msg}
+        if not r.content:
+            items = []
+        elif orjson is not None:
+            items = orjson.loads(r.content)
+        else:
+            items = r.json()
         if not isinstance(items, list):
-            return (
-                jsonify(
-                    {
-                        "status": "error",
-                        "message": ("Resposta inesperada da API"),
-                    }
-                ),
-                502,
-            )
-        # Replace holidays for this year/UF: delete old, then insert fresh
-        try:
-            # Remove todos os feriados do ano informado (independente de UF)
-            # para evitar conflito de PK (date) entre estados diferentes.
-            q = Holiday.query.filter(Holiday.year == year)
-            q.delete(synchronize_session=False)
-            db.session.commit()
-        except Exception:
-            db.session.rollback()
-            return (
-                jsonify(
-                    {
-                        "status": "error",
-                        "message": ("Falha ao limpar dados antigos"),
-                    }
-                ),
-                500,
-            )
-
-        # Insert fresh rows
-        count = 0
-        for it in items:
-            try:
-                date = str(it.get("date") or "").strip()  # YYYY-MM-DD
-                name = (it.get("name") or "").strip()
-                htype = (it.get("type") or "").strip() or None
-                level = (it.get("level") or "").strip() or None
-                if not date or not name:
-                    continue
-                rec = Holiday()
-                rec.date = date
-                rec.name = name
-                rec.type = htype
-                rec.level = level
-                rec.state = state
-                rec.year = year
-                rec.source = "invertexto"
-                db.session.add(rec)
-                count += 1
-            except Exception:
-                continue
-        db.session.commit()
-        # invalidate server-side caches
-        try:
-            _invalidate_holidays_cache()
-        except Exception:
-            pass
-        return jsonify({"status": "success", "count": count})
+            return {"status": "error", "message": "Resposta inesperada da API"}
     except Exception as e:
-        return (
-            jsonify(
-                {
-                    "status": "error",
-                    "message": f"Falha ao consultar API: {e}",
-                }
-            ),
-            502,
-        )
+        return {"status": "error", "message": f"Falha ao consultar API: {e}"}
+    # Replace holidays for this year/UF: delete old, then insert fresh.
+    # Uma única transação: um fsync só e leitores nunca veem o ano vazio.
+    rows = _holiday_rows(items, year, state)
+    try:
+        # Remove todos os feriados do ano informado (independente de UF)
+        # para evitar conflito de PK (date) entre estados diferentes.
+        db.session.execute(text("DELETE FROM holidays WHERE year = :y"), {"y": year})
+        # Insert fresh rows (um único executemany via Core, sem objetos ORM)
+        if rows:
+            db.session.execute(Holiday.__table__.insert(), rows)
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        return {"status": "error", "message": "Falha ao gravar feriados"}
+    # invalidate server-side caches
+    try:
+        _invalidate_holidays_cache()
+    except Exception:
+        pass
+    return {"status": "success", "count": len(rows)}
+
+
+def _holidays_body(data: list[dict]) -> tuple[bytes, str, float]:
+    """Serializa uma vez por preenchimento do cache: (corpo JSON, ETag, instante)."""
+    body = app.json.dumps(data).encode()
+    etag = '"' + hashlib.md5(body, usedforsecurity=False).hexdigest() + '"'
+    return body, etag, time.time()
+
+
+def _holidays_response(body: bytes, etag: str, at: float):
+    # max-age = o que resta do bucket de TTL do cache do servidor, para o
+    # cliente não guardar a resposta além da próxima renovação aqui
+    now = int(time.time())
+    remaining = (now // _HOLIDAYS_TTL_SECONDS + 1) * _HOLIDAYS_TTL_SECONDS - now
+    headers = {
+        "Cache-Control": f"public, max-age={max(1, remaining)}",
+        "Age": str(max(0, now - int(at))),
+        "ETag": etag,
+    }
+    if request.headers.get("If-None-Match") == etag:
+        # curto-circuito 304: sem corpo nem serialização
+        return "", 304, headers
+    # hit do cache: bytes prontos, sem serializar de novo
+    return Response(body, mimetype="application/json", headers=headers)
+
+
+# Colunas de Holiday.to_dict, lidas sem hidratar objetos ORM
+_HOLIDAY_COLS = (
+    Holiday.date,
+    Holiday.name,
+    Holiday.type,
+    Holiday.level,
+    Holiday.state,
+    Holiday.year,
+    Holiday.source,
+)
+_HOLIDAYS_RANGE_STMT = select(*_HOLIDAY_COLS).where(
+    Holiday.date.between(bindparam("start"), bindparam("end"))
+)
+_HOLIDAYS_YEAR_STMT = select(*_HOLIDAY_COLS).where(Holiday.year == bindparam("year"))
+
+
+def _holiday_rows_to_dicts(result) -> list[dict]:
+    # RowMapping já tem as chaves de to_dict (nomes das colunas)
+    return [dict(r) for r in result.mappings()]
+
+
+# lru_cache limita a memória (LRU: clientes variando start/end não crescem
+# o cache sem limite); ttl_bucket (time.time() // TTL) expira as entradas e
+# gen reflete _invalidate_holidays_cache. Retornam (corpo, ETag, instante).
+_HOLIDAYS_RANGE_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=_HOLIDAYS_RANGE_CACHE_SIZE)
+def _holidays_range_lookup(start: str, end: str, ttl_bucket: int, gen: int):
+    rows = db.session.execute(_HOLIDAYS_RANGE_STMT, {"start": start, "end": end})
+    return _holidays_body(_holiday_rows_to_dicts(rows))
+
+
+@functools.lru_cache(maxsize=128)
+def _holidays_year_lookup(year: int, ttl_bucket: int, gen: int):
+    rows = db.session.execute(_HOLIDAYS_YEAR_STMT, {"year": year})
+    return _holidays_body(_holiday_rows_to_dicts(rows))
+
+
+_ISO_DATE_RE = re.compile(r"^\d{4}-(?:0[1-9]|1[0-2])-(?:0[1-9]|[12]\d|3[01])$")
+
+
+def _holidays_ttl_bucket() -> int:
+    return int(time.time()) // _HOLIDAYS_TTL_SECONDS
 
 
 @app.route("/holidays/range")
@@ -1014,30 +1355,13 @@ def holidays_in_range():
     """
     start = (request.args.get("start") or "").strip()
     end = (request.args.get("end") or "").strip()
-    if not start or not end:
-        return jsonify([])
-    try:
-        # normalize and validate
-        datetime.strptime(start, "%Y-%m-%d")
-        datetime.strptime(end, "%Y-%m-%d")
-    except Exception:
+    # validar o formato basta: a comparação no SQLite é por string ISO
+    if not (_ISO_DATE_RE.match(start) and _ISO_DATE_RE.match(end)):
         return jsonify([])
     # SQLite string compare works for ISO dates
-    # Try in-memory cache
-    key = (start, end)
-    now = _utcnow()
-    cached = _HOLIDAYS_RANGE_CACHE.get(key)
-    cached_at = _ensure_aware_utc(cached.get("at") if cached else None) if cached else None
-    if cached and cached_at and (now - cached_at) <= timedelta(seconds=_HOLIDAYS_TTL_SECONDS):
-        resp = jsonify(cached.get("data", []))
-        resp.headers["Cache-Control"] = f"public, max-age={_HOLIDAYS_TTL_SECONDS}"
-        return resp
-    rows = Holiday.query.filter(Holiday.date >= start).filter(Holiday.date <= end).all()
-    data = [h.to_dict() for h in rows]
-    _HOLIDAYS_RANGE_CACHE[key] = {"data": data, "at": now}
-    resp = jsonify(data)
-    resp.headers["Cache-Control"] = f"public, max-age={_HOLIDAYS_TTL_SECONDS}"
-    return resp
+    return _holidays_response(
+        *_holidays_range_lookup(start, end, _holidays_ttl_bucket(), _HOLIDAYS_GEN)
+    )
 
 
 @app.route("/holidays/year")
@@ -1052,24 +1376,91 @@ def holidays_by_year():
         year = 0
     if year <= 0:
         return jsonify([])
-    now = _utcnow()
-    cached = _HOLIDAYS_YEAR_CACHE.get(year)
-    cached_at = _ensure_aware_utc(cached.get("at") if cached else None) if cached else None
-    if cached and cached_at and (now - cached_at) <= timedelta(seconds=_HOLIDAYS_TTL_SECONDS):
-        resp = jsonify(cached.get("data", []))
-        resp.headers["Cache-Control"] = f"public, max-age={_HOLIDAYS_TTL_SECONDS}"
-        return resp
-    rows = Holiday.query.filter(Holiday.year == year).all()
-    data = [h.to_dict() for h in rows]
-    _HOLIDAYS_YEAR_CACHE[year] = {"data": data, "at": now}
-    resp = jsonify(data)
-    resp.headers["Cache-Control"] = f"public, max-age={_HOLIDAYS_TTL_SECONDS}"
-    return resp
+    return _holidays_response(*_holidays_year_lookup(year, _holidays_ttl_bucket(), _HOLIDAYS_GEN))
+
+
+def _ensure_indexes() -> None:
+    """Cria (se faltarem) os índices e a coluna updated_at em bancos já
+    existentes.
+
+    create_all não altera tabelas já criadas, então o que foi declarado
+    no modelo é aplicado aqui de forma idempotente. Best-effort.
+    """
+    try:
+        cols = {row[1] for row in db.session.execute(text("PRAGMA table_info(calendar_event)"))}
+        if cols and "updated_at" not in cols:
+            db.session.execute(text("ALTER TABLE calendar_event ADD COLUMN updated_at DATETIME"))
+        db.session.execute(
+            text(
+                "CREATE INDEX IF NOT EXISTS ix_calendar_event_updated_at"
+                " ON calendar_event(updated_at)"
+            )
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+    try:
+        db.session.execute(
+            text('CREATE INDEX IF NOT EXISTS ix_event_range ON calendar_event("end", start)')
+        )
+        db.session.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_event_prof ON calendar_event(profissional_id)")
+        )
+        db.session.execute(
+            text("CREATE INDEX IF NOT EXISTS ix_holidays_year_date ON holidays(year, date)")
+        )
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+    # Prefixo de nome em /buscar_nomes (LIKE 'q%' COLLATE NOCASE) usa este índice
+    try:
+        with pacientes_engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS ix_pac_nome_nocase ON pacientes(nome COLLATE NOCASE)"
+            )
+    except Exception:
+        pass
+
+
+def _ensure_pacientes_fts() -> None:
+    """Cria e reconstrói o índice FTS5 de nomes usado por /buscar_nomes.
+
+    Tabela de conteúdo externo (pacientes) mantida em sincronia por
+    triggers. Se o SQLite não tiver FTS5, nada é criado e a busca
+    continua via LIKE. Best-effort.
+    """
+    try:
+        with pacientes_engine.begin() as conn:
+            conn.exec_driver_sql(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS pacientes_fts USING fts5("
+                "nome, content='pacientes', content_rowid='id', "
+                "tokenize='unicode61 remove_diacritics 2')"
+            )
+            conn.exec_driver_sql(
+                "CREATE TRIGGER IF NOT EXISTS pacientes_fts_ai AFTER INSERT ON pacientes "
+                "BEGIN INSERT INTO pacientes_fts(rowid, nome) VALUES (new.id, new.nome); END"
+            )
+            conn.exec_driver_sql(
+                "CREATE TRIGGER IF NOT EXISTS pacientes_fts_ad AFTER DELETE ON pacientes "
+                "BEGIN INSERT INTO pacientes_fts(pacientes_fts, rowid, nome) "
+                "VALUES ('delete', old.id, old.nome); END"
+            )
+            conn.exec_driver_sql(
+                "CREATE TRIGGER IF NOT EXISTS pacientes_fts_au AFTER UPDATE OF nome ON pacientes "
+                "BEGIN INSERT INTO pacientes_fts(pacientes_fts, rowid, nome) "
+                "VALUES ('delete', old.id, old.nome); "
+                "INSERT INTO pacientes_fts(rowid, nome) VALUES (new.id, new.nome); END"
+            )
+            conn.exec_driver_sql("INSERT INTO pacientes_fts(pacientes_fts) VALUES('rebuild')")
+    except Exception:
+        pass
 
 
 if __name__ == "__main__":
     with app.app_context():
         db.create_all()
+        _ensure_indexes()
+        _ensure_pacientes_fts()
         # Add a sample event if DB is empty
         if CalendarEvent.query.count() == 0:
             sample = CalendarEvent(
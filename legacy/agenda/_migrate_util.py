@@ -0,0 +1,23 @@
+"""Helpers compartilhados pelos scripts migrate_* da agenda."""
+
+from __future__ import annotations
+
+import sqlite3
+
+
+def open_db(path: str) -> sqlite3.Connection:
+    """Abre o SQLite já com os PRAGMAs de escrita ajustados.
+
+    WAL + synchronous=NORMAL reduzem os fsyncs de cada ALTER/COMMIT; o app
+    também roda em WAL, então o modo persistido no arquivo não muda nada.
+    """
+    conn = sqlite3.connect(path)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    return conn
+
+
+def has_column(cur, table: str, col: str) -> bool:
+    """True se a coluna já existe (evita tentar o ALTER e falhar)."""
+    return any(r[1] == col for r in cur.execute(f"PRAGMA table_info({table})"))
@@ -1,82 +1,52 @@
 import os
 import sqlite3
 
-# Verificar estrutura do users.db
-try:
-    users_path = os.path.abspath(
-        os.path.join(os.path.dirname(__file__), os.pardir, "instance", "users.db")
-    )
-    conn = sqlite3.connect(users_path)
-    cursor = conn.cursor()
-
-    # Listar tabelas
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
-    print("Tabelas no users.db:", tables)
-
-    # Se existe tabela users, verificar estrutura
-    if ("users",) in tables:
-        cursor.execute("PRAGMA table_info(users)")
-        columns = cursor.fetchall()
-        print("Estrutura da tabela users:", columns)
-
-        # Mostrar alguns dados de exemplo
-        cursor.execute("SELECT * FROM users LIMIT 3")
-        samples = cursor.fetchall()
-        print("Dados de exemplo:", samples)
-
-    conn.close()
-except Exception as e:
-    print("Erro ao acessar users.db:", e)
-
-# Verificar estrutura do pacientes.db também
-try:
-    pacientes_path = os.path.abspath(
-        os.path.join(os.path.dirname(__file__), os.pardir, "instance", "pacientes.db")
-    )
-    conn = sqlite3.connect(pacientes_path)
-    cursor = conn.cursor()
-
-    # Listar tabelas
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
-    print("\nTabelas no pacientes.db:", tables)
-
-    # Se existe tabela pacientes, verificar estrutura
-    if ("pacientes",) in tables:
-        cursor.execute("PRAGMA table_info(pacientes)")
-        columns = cursor.fetchall()
-        print("Estrutura da tabela pacientes:", columns)
-
-        # Mostrar alguns dados de exemplo
-        cursor.execute("SELECT * FROM pacientes LIMIT 3")
-        samples = cursor.fetchall()
-        print("Dados de exemplo:", samples)
+_INSTANCE = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir, "instance"))
+
+# (alias, arquivo, tabela principal a inspecionar)
+DATABASES = [
+    ("users", "users.db", "users"),
+    ("pac", "pacientes.db", "pacientes"),
+    ("cal", "calendario.db", "calendar_event"),
+]
+
+# Uma única conexão: cada banco é anexado (ATTACH, somente leitura para não
+# criar arquivos vazios) e as tabelas de todos saem de uma só consulta.
+conn = sqlite3.connect(":memory:", uri=True)
+cursor = conn.cursor()
+attached = []
+for alias, fname, main_table in DATABASES:
+    path = os.path.join(_INSTANCE, fname)
+    try:
+        cursor.execute(f"ATTACH DATABASE ? AS {alias}", (f"file:{path}?mode=ro",))
+        attached.append((alias, fname, main_table))
+    except Exception as e:
+        print(f"Erro ao acessar {fname}:", e)
 
-    conn.close()
-except Exception as e:
-    print("Erro ao acessar pacientes.db:", e)
+tables: dict[str, list[tuple]] = {alias: [] for alias, _, _ in attached}
+if attached:
+    try:
+        cursor.execute(
+            " UNION ALL ".join(
+                f"SELECT '{alias}', name FROM {alias}.sqlite_master WHERE type='table'"
+                for alias, _, _ in attached
+            )
+        )
+        for alias, name in cursor.fetchall():
+            tables[alias].append((name,))
+    except Exception as e:
+        print("Erro ao listar tabelas:", e)
 
-# Verificar estrutura do calendario.db (raiz e instance)
-for path in [
-    os.path.abspath(
-        os.path.join(os.path.dirname(__file__), os.pardir, "instance", "calendario.db")
-    ),
-]:
+for alias, fname, main_table in attached:
     try:
-        print(f"\nVerificando {path}...")
-        conn = sqlite3.connect(path)
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-        tables = cursor.fetchall()
-        print("Tabelas:", tables)
-        if ("calendar_event",) in tables:
-            cursor.execute("PRAGMA table_info(calendar_event)")
-            columns = cursor.fetchall()
-            print("Estrutura da tabela calendar_event:", columns)
-            cursor.execute("SELECT * FROM calendar_event LIMIT 3")
-            samples = cursor.fetchall()
-            print("Dados de exemplo:", samples)
-        conn.close()
+        print(f"\nTabelas no {fname}:", tables[alias])
+        # Se existe a tabela principal, verificar estrutura e exemplos
+        if (main_table,) in tables[alias]:
+            cursor.execute(f"PRAGMA {alias}.table_info({main_table})")
+            print(f"Estrutura da tabela {main_table}:", cursor.fetchall())
+            cursor.execute(f"SELECT * FROM {alias}.{main_table} LIMIT 3")
+            print("Dados de exemplo:", cursor.fetchall())
     except Exception as e:
-        print(f"Erro ao acessar {path}:", e)
+        print(f"Erro ao acessar {fname}:", e)
+
+conn.close()
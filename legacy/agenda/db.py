@@ -1,6 +1,38 @@
 from flask_sqlalchemy import SQLAlchemy
+from sqlalchemy import Engine, event
 
 # Global SQLAlchemy instance to be initialized in the app factory
 # Keeps models decoupled from the Flask app object
 
 db = SQLAlchemy()
+
+
+def _sqlite_pragmas_on_connect(dbapi_connection, connection_record) -> None:
+    """WAL + synchronous=NORMAL: leitores não bloqueiam escritas e cada commit
+    faz menos fsyncs; cache, temporários e mmap em memória."""
+    cur = dbapi_connection.cursor()
+    try:
+        try:
+            cur.execute("PRAGMA journal_mode=WAL")
+        except Exception:
+            # banco somente leitura/bloqueado: seguir com o journal atual
+            pass
+        cur.execute("PRAGMA synchronous=NORMAL")
+        cur.execute("PRAGMA cache_size=-64000")
+        cur.execute("PRAGMA temp_store=MEMORY")
+        cur.execute("PRAGMA mmap_size=268435456")
+    finally:
+        cur.close()
+
+
+def apply_sqlite_pragmas(engine: Engine) -> None:
+    """Aplica os PRAGMAs acima a cada nova conexão de ``engine`` (só SQLite).
+
+    Registrado por engine, não em ``Engine`` globalmente, para não alterar
+    engines de terceiros no mesmo processo. Usado pela Agenda e pelo app
+    principal (binds do Flask-SQLAlchemy e MultiDB). Idempotente.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    if not event.contains(engine, "connect", _sqlite_pragmas_on_connect):
+        event.listen(engine, "connect", _sqlite_pragmas_on_connect)
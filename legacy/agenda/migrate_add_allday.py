@@ -1,15 +1,12 @@
+"""Obsoleto: use migrate_calendar_schema.py (mantido por compatibilidade)."""
+
 import os
-import sqlite3
 
-db_path = os.path.join(os.path.dirname(__file__), os.pardir, "instance", "calendario.db")
-db_path = os.path.abspath(db_path)
-os.makedirs(os.path.dirname(db_path), exist_ok=True)
-conn = sqlite3.connect(db_path)
-c = conn.cursor()
 try:
-    c.execute("ALTER TABLE calendar_event ADD COLUMN " "all_day BOOLEAN NOT NULL DEFAULT 0;")
-    print("Coluna all_day adicionada com sucesso.")
-except Exception as e:
-    print("Erro ou coluna já existe:", e)
-conn.commit()
-conn.close()
+    from .migrate_calendar_schema import DB_PATHS, main
+except ImportError:  # executado como script (python agenda/migrate_*.py)
+    from migrate_calendar_schema import DB_PATHS, main
+
+# Como antes: apenas o calendario.db em ../instance (criando a pasta)
+os.makedirs(os.path.dirname(os.path.abspath(DB_PATHS[0])), exist_ok=True)
+main(["all_day"], [DB_PATHS[0]])
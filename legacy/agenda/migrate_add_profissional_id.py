@@ -1,22 +1,8 @@
-import os
-import sqlite3
+"""Obsoleto: use migrate_calendar_schema.py (mantido por compatibilidade)."""
 
-DB_PATHS = [
-    os.path.join(os.path.dirname(__file__), os.pardir, "instance", "calendario.db"),
-    os.path.join(os.path.dirname(__file__), "calendario.db"),
-    os.path.join(os.path.dirname(__file__), "instance", "calendario.db"),
-]
+try:
+    from .migrate_calendar_schema import main
+except ImportError:  # executado como script (python agenda/migrate_*.py)
+    from migrate_calendar_schema import main
 
-for path in DB_PATHS:
-    if not os.path.exists(path):
-        continue
-    print(f"Migrando banco: {path}")
-    conn = sqlite3.connect(path)
-    c = conn.cursor()
-    try:
-        c.execute("ALTER TABLE calendar_event " "ADD COLUMN profissional_id INTEGER NULL;")
-        print(" - Coluna 'profissional_id' adicionada em calendar_event.")
-    except Exception as e:
-        print(" - Erro ou coluna já existe:", e)
-    conn.commit()
-    conn.close()
+main(["profissional_id"])
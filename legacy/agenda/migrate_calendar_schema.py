@@ -0,0 +1,93 @@
+"""
+Migração única das colunas de calendar_event (all_day, notes, profissional_id,
+updated_at) e dos índices de consulta por período/dentista.
+
+Abre cada calendario.db uma vez e aplica os ALTERs pendentes numa só
+transação (um único fsync). Substitui migrate_add_allday.py,
+migrate_add_notes.py e migrate_add_profissional_id.py, que agora delegam
+para cá.
+
+Uso:
+  python -m agenda.migrate_calendar_schema
+ou
+  python agenda/migrate_calendar_schema.py
+"""
+
+from __future__ import annotations
+
+import os
+
+try:
+    from ._migrate_util import has_column, open_db
+except ImportError:  # executado como script (python agenda/migrate_*.py)
+    from _migrate_util import has_column, open_db
+
+_HERE = os.path.dirname(__file__)
+
+DB_PATHS = [
+    os.path.join(_HERE, os.pardir, "instance", "calendario.db"),
+    os.path.join(_HERE, "calendario.db"),
+    os.path.join(_HERE, "instance", "calendario.db"),
+]
+
+# coluna -> definição usada no ADD COLUMN
+COLUMNS = {
+    "all_day": "BOOLEAN NOT NULL DEFAULT 0",
+    "notes": "VARCHAR(500)",
+    "profissional_id": "INTEGER NULL",
+    "updated_at": "DATETIME",
+}
+
+# índice -> colunas; os mesmos de CalendarEvent.__table_args__ (create_all
+# só os cria em tabelas novas)
+INDEXES = {
+    "ix_cal_end_start": ("end", "start"),
+    "ix_cal_prof_start": ("profissional_id", "start"),
+    "ix_calendar_event_updated_at": ("updated_at",),
+}
+
+
+def migrate(path: str, columns: list[str] | None = None) -> list[str]:
+    """Adiciona as colunas que faltam em calendar_event e cria os índices
+    ausentes; retorna as colunas criadas."""
+    conn = open_db(path)
+    conn.isolation_level = None  # BEGIN/COMMIT explícitos
+    try:
+        cur = conn.cursor()
+        cur.execute("BEGIN")
+        added = []
+        for col in columns or list(COLUMNS):
+            if has_column(cur, "calendar_event", col):
+                continue
+            cur.execute(f"ALTER TABLE calendar_event ADD COLUMN {col} {COLUMNS[col]};")
+            added.append(col)
+        for name, cols in INDEXES.items():
+            # pula índices de colunas ainda não migradas (ex.: só --notes)
+            if not all(has_column(cur, "calendar_event", c) for c in cols):
+                continue
+            col_sql = ", ".join(f'"{c}"' for c in cols)
+            cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON calendar_event ({col_sql})")
+        cur.execute("COMMIT")
+        return added
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        conn.close()
+
+
+def main(columns: list[str] | None = None, paths: list[str] | None = None) -> int:
+    for path in paths or DB_PATHS:
+        if not os.path.exists(path):
+            continue
+        print(f"Migrando banco: {path}")
+        added = migrate(path, columns)
+        for col in added:
+            print(f" - Coluna '{col}' adicionada em calendar_event.")
+        if not added:
+            print(" - Nenhuma coluna pendente.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -12,7 +12,11 @@ or
 from __future__ import annotations
 
 import os
-import sqlite3
+
+try:
+    from ._migrate_util import open_db
+except ImportError:  # executado como script (python agenda/migrate_*.py)
+    from _migrate_util import open_db
 
 
 def instance_path() -> str:
@@ -23,7 +27,7 @@ def instance_path() -> str:
 def drop_from_app_db(inst_dir: str) -> None:
     app_db = os.path.join(inst_dir, "app.db")
     os.makedirs(os.path.dirname(app_db), exist_ok=True)
-    conn = sqlite3.connect(app_db)
+    conn = open_db(app_db)
     try:
         cur = conn.cursor()
         cur.execute("PRAGMA foreign_keys=OFF;")
@@ -42,7 +46,7 @@ def drop_from_app_db(inst_dir: str) -> None:
 def create_in_calendario_db(inst_dir: str) -> None:
     cal_db = os.path.join(inst_dir, "calendario.db")
     os.makedirs(os.path.dirname(cal_db), exist_ok=True)
-    conn = sqlite3.connect(cal_db)
+    conn = open_db(cal_db)
     try:
         cur = conn.cursor()
         # Create calendar_event table (if not exists)
@@ -74,8 +78,13 @@ def create_in_calendario_db(inst_dir: str) -> None:
                 ");"
             )
         )
+        # Índice composto: DELETE por ano no refresh e consulta /holidays/year
+        cur.execute("CREATE INDEX IF NOT EXISTS ix_holidays_year_date ON holidays(year, date);")
         conn.commit()
-        print("Ensured tables exist in calendario.db: calendar_event, holidays")
+        print(
+            "Ensured tables exist in calendario.db: calendar_event, holidays "
+            "(+ ix_holidays_year_date)"
+        )
     finally:
         conn.close()
 
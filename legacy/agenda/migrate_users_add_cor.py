@@ -1,18 +1,22 @@
 import os
-import sqlite3
+
+try:
+    from ._migrate_util import has_column, open_db
+except ImportError:  # executado como script (python agenda/migrate_*.py)
+    from _migrate_util import has_column, open_db
 
 USERS_DB = os.path.join(os.path.dirname(__file__), os.pardir, "instance", "users.db")
 USERS_DB = os.path.abspath(USERS_DB)
 
 if os.path.exists(USERS_DB):
     print(f"Migrando banco de usuários: {USERS_DB}")
-    conn = sqlite3.connect(USERS_DB)
+    conn = open_db(USERS_DB)
     c = conn.cursor()
-    try:
+    if has_column(c, "users", "cor"):
+        print(" - Coluna 'cor' já existe na tabela users.")
+    else:
         c.execute("ALTER TABLE users ADD COLUMN cor VARCHAR(20) NULL;")
         print(" - Coluna 'cor' adicionada na tabela users.")
-    except Exception as e:
-        print(" - Erro ou coluna já existe:", e)
     conn.commit()
     conn.close()
 else:
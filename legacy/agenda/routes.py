@@ -1,12 +1,28 @@
 from __future__ import annotations
 
+import functools
 import os
-import sqlite3
+import re
+import time
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from flask import Blueprint, current_app, jsonify, render_template, request
-from sqlalchemy import create_engine, or_, text
+from flask import Blueprint, Response, current_app, jsonify, render_template, request
+from sqlalchemy import Engine, bindparam, create_engine, func, insert, or_, update
+from sqlalchemy.orm import raiseload
+from werkzeug.http import http_date
+
+from .db import apply_sqlite_pragmas
+
+try:
+    from dateutil.parser import parse as _du_parse
+except Exception:  # pragma: no cover - optional dep defensive
+    _du_parse = None  # type: ignore
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dep defensive
+    orjson = None  # type: ignore
 
 try:
     # Prefer the host application's SQLAlchemy instance
@@ -22,9 +38,54 @@ bp = Blueprint(
 )
 
 
+def _json(data) -> Response:
+    """Resposta JSON serializada por orjson (bytes direto, em C) quando
+    disponível; sem orjson, jsonify."""
+    if orjson is None:
+        return jsonify(data)
+    return Response(orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS), mimetype="application/json")
+
+
+def _fast_parse(s: str) -> datetime:
+    """Parse de start/end gravados: normalize_for_storage só escreve
+    %Y-%m-%d ou %Y-%m-%dT%H:%M:%S; dateutil fica para dados antigos."""
+    try:
+        if len(s) == 10:
+            return datetime.strptime(s, "%Y-%m-%d")
+        return datetime.strptime(s, "%Y-%m-%dT%H:%M:%S")
+    except (TypeError, ValueError):
+        if _du_parse is None:
+            raise
+        return _du_parse(s)
+
+
+def _is_all_day(start: str, end: str) -> bool:
+    try:
+        start_dt = _fast_parse(start)
+        end_dt = _fast_parse(end)
+        if len(start) == 10 and len(end) == 10:
+            return True
+        return (
+            start_dt.hour == 0
+            and start_dt.minute == 0
+            and start_dt.second == 0
+            and end_dt.hour == 0
+            and end_dt.minute == 0
+            and end_dt.second == 0
+            and (end_dt - start_dt).total_seconds() % 86400 == 0
+        )
+    except Exception:
+        return False
+
+
 # Models colocados aqui para manter o módulo autocontido
 class CalendarEvent(db.Model):
     __bind_key__ = "calendario"
+    # /events filtra end >= início AND start < fim, opcionalmente por dentista
+    __table_args__ = (
+        db.Index("ix_cal_end_start", "end", "start"),
+        db.Index("ix_cal_prof_start", "profissional_id", "start"),
+    )
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(120), nullable=False)
     start = db.Column(db.String(30), nullable=False)
@@ -32,29 +93,15 @@ class CalendarEvent(db.Model):
     color = db.Column(db.String(20), nullable=True)
     notes = db.Column(db.String(500), nullable=True)
     profissional_id = db.Column(db.Integer, nullable=True)
+    # base do ETag de /events (max(updated_at) + count do conjunto filtrado)
+    updated_at = db.Column(
+        db.DateTime,
+        default=datetime.utcnow,
+        onupdate=datetime.utcnow,
+        index=True,
+    )
 
     def to_dict(self) -> dict[str, Any]:
-        from dateutil.parser import parse
-
-        try:
-            start_dt = parse(self.start)
-            end_dt = parse(self.end)
-            if len(self.start) == 10 and len(self.end) == 10:
-                all_day = True
-            elif (
-                start_dt.hour == 0
-                and start_dt.minute == 0
-                and start_dt.second == 0
-                and end_dt.hour == 0
-                and end_dt.minute == 0
-                and end_dt.second == 0
-                and (end_dt - start_dt).total_seconds() % 86400 == 0
-            ):
-                all_day = True
-            else:
-                all_day = False
-        except Exception:
-            all_day = False
         return {
             "id": self.id,
             "title": self.title,
@@ -62,11 +109,37 @@ class CalendarEvent(db.Model):
             "end": self.end,
             "color": self.color,
             "notes": self.notes,
-            "allDay": all_day,
+            "allDay": _is_all_day(self.start, self.end),
             "profissional_id": self.profissional_id,
         }
 
 
+# Colunas de CalendarEvent.to_dict, na ordem usada por _event_row_dict
+_EVENT_COLS = (
+    CalendarEvent.id,
+    CalendarEvent.title,
+    CalendarEvent.start,
+    CalendarEvent.end,
+    CalendarEvent.color,
+    CalendarEvent.notes,
+    CalendarEvent.profissional_id,
+)
+
+
+def _event_row_dict(row) -> dict[str, Any]:
+    """Mesmo formato de CalendarEvent.to_dict, a partir de uma linha de _EVENT_COLS."""
+    return {
+        "id": row[0],
+        "title": row[1],
+        "start": row[2],
+        "end": row[3],
+        "color": row[4],
+        "notes": row[5],
+        "allDay": _is_all_day(row[2], row[3]),
+        "profissional_id": row[6],
+    }
+
+
 class AppSetting(db.Model):
     __tablename__ = "app_settings"
     key = db.Column(db.String(100), primary_key=True)
@@ -81,6 +154,8 @@ class AppSetting(db.Model):
 class Holiday(db.Model):
     __bind_key__ = "calendario"
     __tablename__ = "holidays"
+    # DELETE por ano (refresh) e /holidays/year; o range por data usa a PK
+    __table_args__ = (db.Index("ix_holidays_year_date", "year", "date"),)
     date = db.Column(db.String(10), primary_key=True)
     name = db.Column(db.String(200), nullable=False)
     type = db.Column(db.String(50), nullable=True)
@@ -112,26 +187,74 @@ try:
 except Exception:  # pragma: no cover - optional dep defensive
     requests = None  # type: ignore
 
-_HOLIDAYS_YEAR_CACHE: dict[int, dict] = {}
-_HOLIDAYS_RANGE_CACHE: dict[tuple[str, str], dict] = {}
+# Sessão HTTP da API Invertexto (keep-alive + pool), criada no primeiro
+# refresh: refreshes seguidos (vários anos/UFs) reaproveitam a conexão TLS.
+_HTTP_SESSION = None
+
+
+def _http_session():
+    global _HTTP_SESSION
+    if _HTTP_SESSION is None:
+        from requests.adapters import HTTPAdapter
+        from urllib3.util.retry import Retry
+
+        session = requests.Session()
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=4,
+                pool_maxsize=10,
+                # raise_on_status=False: esgotadas as tentativas, devolve a
+                # resposta final para as mensagens por status (401/429/...)
+                max_retries=Retry(
+                    total=2,
+                    backoff_factor=0.3,
+                    status_forcelist=[429, 502, 503, 504],
+                    raise_on_status=False,
+                ),
+            ),
+        )
+        _HTTP_SESSION = session
+    return _HTTP_SESSION
+
+
 _HOLIDAYS_TTL_SECONDS = 3600  # 1h
+_HOLIDAYS_CACHE_SIZE = 512
 
 
-def _utcnow() -> datetime:
-    return datetime.now(UTC)
+def _holidays_ttl_bucket() -> int:
+    # muda a cada _HOLIDAYS_TTL_SECONDS: entra na chave dos caches de
+    # feriados e faz as entradas expirarem sem guardar timestamp
+    return int(time.time()) // _HOLIDAYS_TTL_SECONDS
 
 
-def _ensure_aware_utc(dt: datetime | None) -> datetime | None:
-    if not dt:
-        return None
-    if dt.tzinfo is None:
-        return dt.replace(tzinfo=UTC)
-    return dt.astimezone(UTC)
+# Incrementado a cada _invalidate_holidays_cache; entra na chave dos caches
+# de feriados de todos os apps (um refresh invalida também os demais apps
+# que leem o mesmo calendario.db)
+_HOLIDAYS_GEN = 0
 
 
 def _invalidate_holidays_cache() -> None:
-    _HOLIDAYS_YEAR_CACHE.clear()
-    _HOLIDAYS_RANGE_CACHE.clear()
+    global _HOLIDAYS_GEN
+    _HOLIDAYS_GEN += 1
+    current_app.extensions.pop("agenda_holidays_cache", None)
+
+
+def _ensure_calendar_schema() -> None:
+    """Adiciona updated_at (e seu índice) a calendar_event em bancos já
+    existentes; create_all não altera tabelas criadas. Best-effort."""
+    try:
+        engine = db.engines.get("calendario") or db.engine
+        with engine.begin() as conn:
+            cols = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(calendar_event)")}
+            if cols and "updated_at" not in cols:
+                conn.exec_driver_sql("ALTER TABLE calendar_event ADD COLUMN updated_at DATETIME")
+            conn.exec_driver_sql(
+                "CREATE INDEX IF NOT EXISTS ix_calendar_event_updated_at "
+                "ON calendar_event (updated_at)"
+            )
+    except Exception:
+        pass
 
 
 def _db_path(name: str) -> str:
@@ -164,6 +287,84 @@ def delete_setting(key: str) -> None:
         db.session.commit()
 
 
+# users.db: um engine por caminho (QueuePool reaproveita conexões entre
+# requisições, uma por thread em uso) e os SELECTs de users montados uma vez
+# por mtime do arquivo, sem PRAGMA a cada chamada de /dentists ou /events.
+_USERS_ENGINES: dict[str, Engine] = {}
+# db_path -> (mtime, SQL de /dentists ou None sem coluna id, tem cor?, SQL dos ids válidos)
+_USERS_SQL_CACHE: dict[str, tuple[float, str | None, bool, str]] = {}
+
+
+def _users_engine(db_path: str) -> Engine:
+    engine = _USERS_ENGINES.get(db_path)
+    if engine is None:
+        engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+        apply_sqlite_pragmas(engine)
+        _USERS_ENGINES[db_path] = engine
+    return engine
+
+
+def _users_sql(db_path: str) -> tuple[str | None, bool, str]:
+    """(SQL de /dentists, tem cor?, SQL dos ids válidos) para o esquema atual
+    de users; o PRAGMA só roda quando o mtime de users.db muda."""
+    mtime = os.path.getmtime(db_path)
+    cached = _USERS_SQL_CACHE.get(db_path)
+    if cached and cached[0] == mtime:
+        return cached[1:]
+    with _users_engine(db_path).connect() as conn:
+        cols = frozenset(row[1] for row in conn.exec_driver_sql("PRAGMA table_info(users)"))
+    where = _users_where(cols)
+    dentists_sql = None
+    color_col = None
+    if "id" in cols:
+        name_candidates = [
+            "nome_profissional",
+            "nome",
+            "name",
+            "full_name",
+            "username",
+        ]
+        name_col = next((c for c in name_candidates if c in cols), None) or "id"
+        color_col = "color" if "color" in cols else ("cor" if "cor" in cols else None)
+        sel_cols = ["id", name_col] + ([color_col] if color_col else [])
+        dentists_sql = f"SELECT {', '.join(sel_cols)} FROM users{where} ORDER BY {name_col}"
+    entry = (mtime, dentists_sql, color_col is not None, f"SELECT id FROM users{where}")
+    _USERS_SQL_CACHE[db_path] = entry
+    return entry[1:]
+
+
+def _users_where(cols: frozenset[str]) -> str:
+    """Mesmo filtro de /dentists: ativos e com cargo dentista/admin."""
+    conditions: list[str] = []
+    if "is_active" in cols:
+        conditions.append("is_active = 1")
+    if "cargo" in cols:
+        conditions.append("cargo IN ('dentista','admin')")
+    return (" WHERE " + " AND ".join(conditions)) if conditions else ""
+
+
+# db_path -> (mtime, instante, ids): refeito quando users.db muda ou após
+# o mesmo TTL do Cache-Control de /dentists
+_VALID_DENTIST_IDS_CACHE: dict[str, tuple[float, float, frozenset[int]]] = {}
+_VALID_DENTIST_IDS_TTL = 300
+
+
+def _valid_dentist_ids(db_path: str) -> frozenset[int]:
+    if not os.path.exists(db_path):
+        return frozenset()
+    mtime = os.path.getmtime(db_path)
+    now = time.monotonic()
+    cached = _VALID_DENTIST_IDS_CACHE.get(db_path)
+    if cached and cached[0] == mtime and now - cached[1] < _VALID_DENTIST_IDS_TTL:
+        return cached[2]
+    _, _, ids_sql = _users_sql(db_path)
+    with _users_engine(db_path).connect() as conn:
+        rows = conn.exec_driver_sql(ids_sql)
+        ids = frozenset(int(r[0]) for r in rows if r and r[0] is not None)
+    _VALID_DENTIST_IDS_CACHE[db_path] = (mtime, now, ids)
+    return ids
+
+
 @bp.route("/")
 def index():
     return render_template("calendar.html")
@@ -176,33 +377,55 @@ def _try_parse(fmt: str, s: str):
         return None
 
 
+# Escada completa (ordem original) de formatos aceitos: (formato, só data)
+_INPUT_FORMATS: tuple[tuple[str, bool], ...] = (
+    ("%d/%m/%Y %H:%M:%S", False),
+    ("%d/%m/%Y %H:%M", False),
+    ("%d/%m/%Y", True),
+    ("%Y-%m-%dT%H:%M:%S", False),
+    ("%Y-%m-%d %H:%M:%S", False),
+    ("%Y-%m-%dT%H:%M", False),
+    ("%Y-%m-%d %H:%M", False),
+    ("%Y-%m-%d", True),
+)
+
+# Atalho pelo formato da string (tamanho + separador): o caso comum vira um
+# único strptime; se falhar (ex.: "2/1/2025"), cai na escada completa
+_SHAPE_TO_FMT: dict[tuple[int, str], tuple[str, bool]] = {
+    (10, "-"): ("%Y-%m-%d", True),
+    (10, "/"): ("%d/%m/%Y", True),
+    (16, "/"): ("%d/%m/%Y %H:%M", False),
+    (19, "/"): ("%d/%m/%Y %H:%M:%S", False),
+    (16, "T"): ("%Y-%m-%dT%H:%M", False),
+    (16, " "): ("%Y-%m-%d %H:%M", False),
+    (19, "T"): ("%Y-%m-%dT%H:%M:%S", False),
+    (19, " "): ("%Y-%m-%d %H:%M:%S", False),
+}
+
+
+def _input_shape(s: str) -> tuple[int, str]:
+    if len(s) > 2 and s[2] == "/":
+        return len(s), "/"
+    return len(s), (s[10] if len(s) > 10 else "-")
+
+
 def parse_input_datetime(raw: Any):
     if not raw:
         return None, None
     s = str(raw).strip()
-    for fmt in ("%d/%m/%Y %H:%M:%S", "%d/%m/%Y %H:%M"):
-        dt = _try_parse(fmt, s)
+    shape = _SHAPE_TO_FMT.get(_input_shape(s))
+    if shape:
+        dt = _try_parse(shape[0], s)
         if dt:
-            return dt, False
-    dt = _try_parse("%d/%m/%Y", s)
-    if dt:
-        return dt, True
-    for fmt in (
-        "%Y-%m-%dT%H:%M:%S",
-        "%Y-%m-%d %H:%M:%S",
-        "%Y-%m-%dT%H:%M",
-        "%Y-%m-%d %H:%M",
-    ):
+            return dt, shape[1]
+    for fmt, is_date_only in _INPUT_FORMATS:
         dt = _try_parse(fmt, s)
         if dt:
-            return dt, False
-    dt = _try_parse("%Y-%m-%d", s)
-    if dt:
-        return dt, True
+            return dt, is_date_only
+    if _du_parse is None:
+        return None, None
     try:
-        from dateutil.parser import parse as du_parse
-
-        dt = du_parse(s, dayfirst=True)
+        dt = _du_parse(s, dayfirst=True)
         is_date_only = len(s) == 10 and s.count("/") + s.count("-") in (2,)
         return dt, is_date_only
     except Exception:
@@ -215,67 +438,96 @@ def normalize_for_storage(dt: datetime, is_date_only: bool) -> str:
     return dt.strftime("%Y-%m-%d") if is_date_only else dt.strftime("%Y-%m-%dT%H:%M:%S")
 
 
-def _apply_query_filters(base_query, query_text: str):
-    qtxt = (query_text or "").strip().lower()
-    if not qtxt:
-        return base_query
+COLOR_WORDS: dict[str, tuple[str, ...]] = {
+    "vermelho": ("#e11d48",),
+    "rosa": ("#f43f5e", "#f472b6"),
+    "rosa-claro": ("#f472b6",),
+    "laranja": ("#f59e42",),
+    "amarelo": ("#fbbf24",),
+    "verde": ("#22c55e",),
+    "verde-agua": ("#10b981",),
+    "verde agua": ("#10b981",),
+    "azul": ("#2563eb",),
+    "azul-escuro": ("#2563eb",),
+    "azul escuro": ("#2563eb",),
+    "azul-claro": ("#0ea5e9",),
+    "azul claro": ("#0ea5e9",),
+    "roxo": ("#6366f1",),
+    "lilás": ("#6366f1",),
+    "lilas": ("#6366f1",),
+    "roxo-escuro": ("#a21caf",),
+    "roxo escuro": ("#a21caf",),
+    "púrpura": ("#a21caf",),
+    "purpura": ("#a21caf",),
+    "cinza": ("#64748b",),
+    "grey": ("#64748b",),
+    "grafite": ("#64748b",),
+}
+
+# Uma passada de regex acha as palavras de cor da busca. O lookahead testa
+# toda posição (palavras sobrepostas) e a alternância prefere a mais longa;
+# _COLOR_CONTAINS devolve também as palavras contidas nela ("rosa-claro"
+# casa "rosa"), como no antigo teste `word in q` palavra a palavra.
+_COLOR_RE = re.compile(
+    "(?=(" + "|".join(map(re.escape, sorted(COLOR_WORDS, key=len, reverse=True))) + "))"
+)
+_COLOR_CONTAINS: dict[str, frozenset[str]] = {
+    w: frozenset(o for o in COLOR_WORDS if o in w) for w in COLOR_WORDS
+}
+
+
+def _hexes_for_color_words(words: set[str]) -> tuple[str, ...]:
+    # únicos, na ordem de COLOR_WORDS
+    hexes: dict[str, None] = {}
+    for word, values in COLOR_WORDS.items():
+        if word in words:
+            hexes.update(dict.fromkeys(values))
+    return tuple(hexes)
+
+
+# Busca que é exatamente uma palavra de cor: resultado pronto
+_COLOR_EXACT: dict[str, tuple[str, ...]] = {
+    w: _hexes_for_color_words(_COLOR_CONTAINS[w]) for w in COLOR_WORDS
+}
+
+
+def _color_hexes_for_query(query_text: str) -> list[str]:
+    q = (query_text or "").strip().lower()
+    if not q:
+        return []
+    hit = _COLOR_EXACT.get(q)
+    if hit is not None:
+        return list(hit)
+    words: set[str] = set()
+    for w in _COLOR_RE.findall(q):
+        words |= _COLOR_CONTAINS[w]
+    hexes = list(_hexes_for_color_words(words))
+    if q.startswith("#") and len(q) in (4, 7) and q not in hexes:
+        hexes.append(q)
+    return hexes
+
+
+@functools.lru_cache(maxsize=128)
+def _query_text_clause(qtxt: str):
+    """Cláusula OR (título, notas, cor) para um texto de busca já
+    normalizado; montada uma vez por texto. Os valores vão como parâmetros
+    (o IN de cores é expandido), então o SQL compilado também é reaproveitado."""
     like = f"%{qtxt}%"
-    col_title = getattr(CalendarEvent, "title")
-    col_notes = getattr(CalendarEvent, "notes")
-    title_match = col_title.ilike(like)
-    notes_match = col_notes.ilike(like)
+    conditions = [CalendarEvent.title.ilike(like), CalendarEvent.notes.ilike(like)]
     # Optional: match color by words (e.g., "vermelho") or hex (e.g., "#ff0000")
-
-    def _color_hexes_for_query(query_text: str) -> list[str]:
-        q = (query_text or "").strip().lower()
-        if not q:
-            return []
-        COLOR_WORDS: dict[str, list[str]] = {
-            "vermelho": ["#e11d48"],
-            "rosa": ["#f43f5e", "#f472b6"],
-            "rosa-claro": ["#f472b6"],
-            "laranja": ["#f59e42"],
-            "amarelo": ["#fbbf24"],
-            "verde": ["#22c55e"],
-            "verde-agua": ["#10b981"],
-            "verde agua": ["#10b981"],
-            "azul": ["#2563eb"],
-            "azul-escuro": ["#2563eb"],
-            "azul escuro": ["#2563eb"],
-            "azul-claro": ["#0ea5e9"],
-            "azul claro": ["#0ea5e9"],
-            "roxo": ["#6366f1"],
-            "lilás": ["#6366f1"],
-            "lilas": ["#6366f1"],
-            "roxo-escuro": ["#a21caf"],
-            "roxo escuro": ["#a21caf"],
-            "púrpura": ["#a21caf"],
-            "purpura": ["#a21caf"],
-            "cinza": ["#64748b"],
-            "grey": ["#64748b"],
-            "grafite": ["#64748b"],
-        }
-        hexes: list[str] = []
-        for word, values in COLOR_WORDS.items():
-            if q == word or word in q:
-                hexes.extend(values)
-        if q.startswith("#") and len(q) in (4, 7):
-            hexes.append(q)
-        # unique
-        seen: set[str] = set()
-        uniq: list[str] = []
-        for h in hexes:
-            if h not in seen:
-                seen.add(h)
-                uniq.append(h)
-        return uniq
-
     color_hexes = _color_hexes_for_query(qtxt)
     if color_hexes:
-        col_color = getattr(CalendarEvent, "color")
-        color_match = col_color.in_(color_hexes)
-        return base_query.filter(or_(title_match, notes_match, color_match))
-    return base_query.filter(or_(title_match, notes_match))
+        conditions.append(
+            CalendarEvent.color.in_(bindparam("color_hexes", color_hexes, expanding=True))
+        )
+    return or_(*conditions)
+
+
+def _apply_query_filters(base_query, query_text: str):
+    qtxt = (query_text or "").strip().lower()
+    if not qtxt:
+        return base_query
+    return base_query.filter(_query_text_clause(qtxt))
 
 
 @bp.route("/settings/invertexto_token", methods=["GET", "POST", "DELETE"])
@@ -295,11 +547,31 @@ def invertexto_token():
     return jsonify({"status": "success"})
 
 
+def _events_cache_headers(q) -> dict[str, str]:
+    """ETag/Last-Modified de /events a partir de uma agregação barata sobre
+    os mesmos filtros; vazio se o banco ainda não tem updated_at."""
+    try:
+        last, count = q.with_entities(
+            func.max(CalendarEvent.updated_at), func.count(CalendarEvent.id)
+        ).one()
+    except Exception:
+        db.session.rollback()
+        return {}
+    last = last.replace(tzinfo=UTC) if last else None
+    stamp = last.timestamp() if last else 0
+    # no-cache: o navegador sempre revalida (304 barato), sem servir cópia velha
+    headers = {"Cache-Control": "private, no-cache", "ETag": f'"{stamp:.6f}:{count}"'}
+    if last:
+        headers["Last-Modified"] = http_date(last)
+    return headers
+
+
 @bp.route("/events")
 def get_events():
     range_start = (request.args.get("start") or "").strip()
     range_end = (request.args.get("end") or "").strip()
-    q = CalendarEvent.query
+    # só as colunas da resposta: sem instanciar objetos ORM por linha
+    q = db.session.query(*_EVENT_COLS)
     query_text = (request.args.get("q") or "").strip()
     dentists_param = (request.args.get("dentists") or "").strip()
     include_unassigned = (request.args.get("include_unassigned") or "").strip() in (
@@ -324,33 +596,10 @@ def get_events():
                 q = q.filter(col_prof.is_(None))
             else:
                 # invalid-only: ids not in the set of currently selectable dentists (active + role), and not null
-                db_path = _db_path("users.db")
-                valid_ids: set[int] = set()
-                if os.path.exists(db_path):
-                    conn: sqlite3.Connection | None = None
-                    try:
-                        conn = sqlite3.connect(db_path)
-                        cur = conn.cursor()
-                        # Determine available columns to apply same filter as /dentists
-                        cur.execute("PRAGMA table_info(users)")
-                        cols = [row[1] for row in cur.fetchall()]
-                        conditions: list[str] = []
-                        if "is_active" in cols:
-                            conditions.append("is_active = 1")
-                        if "cargo" in cols:
-                            conditions.append("cargo IN ('dentista','admin')")
-                        where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
-                        cur.execute(f"SELECT id FROM users{where}")
-                        valid_ids = {int(r[0]) for r in cur.fetchall() if r and r[0] is not None}
-                    finally:
-                        try:
-                            if conn is not None:
-                                conn.close()
-                        except Exception:
-                            pass
+                valid_ids = _valid_dentist_ids(_db_path("users.db"))
                 q = q.filter(CalendarEvent.profissional_id.is_not(None))
                 if valid_ids:
-                    q = q.filter(~CalendarEvent.profissional_id.in_(list(valid_ids)))
+                    q = q.filter(CalendarEvent.profissional_id.not_in(list(valid_ids)))
         except Exception:
             pass
     if range_start and range_end and not query_text:
@@ -364,16 +613,22 @@ def get_events():
             pass
     if query_text:
         q = _apply_query_filters(q, query_text)
+    headers = _events_cache_headers(q)
+    if headers and request.headers.get("If-None-Match") == headers["ETag"]:
+        return "", 304, headers
     try:
-        events = q.all()
-        return jsonify([e.to_dict() for e in events])
+        resp = _json([_event_row_dict(row) for row in q.yield_per(500)])
     except Exception:
         return jsonify([])
+    for k, v in headers.items():
+        resp.headers[k] = v
+    return resp
 
 
 @bp.route("/events/search_range")
 def events_search_range():
-    q = CalendarEvent.query
+    # raiseload: um lazy load acidental falha em vez de virar N+1
+    q = db.session.query(CalendarEvent).options(raiseload("*"))
     dentists_param = (request.args.get("dentists") or "").strip()
     include_unassigned = (request.args.get("include_unassigned") or "").strip() in (
         "1",
@@ -397,46 +652,24 @@ def events_search_range():
                 q = q.filter(col_prof.is_(None))
             else:
                 # invalid-only based on active dentists/admins as valid
-                db_path = _db_path("users.db")
-                valid_ids: set[int] = set()
-                if os.path.exists(db_path):
-                    conn: sqlite3.Connection | None = None
-                    try:
-                        conn = sqlite3.connect(db_path)
-                        cur = conn.cursor()
-                        cur.execute("PRAGMA table_info(users)")
-                        cols = [row[1] for row in cur.fetchall()]
-                        conditions: list[str] = []
-                        if "is_active" in cols:
-                            conditions.append("is_active = 1")
-                        if "cargo" in cols:
-                            conditions.append("cargo IN ('dentista','admin')")
-                        where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
-                        cur.execute(f"SELECT id FROM users{where}")
-                        valid_ids = {int(r[0]) for r in cur.fetchall() if r and r[0] is not None}
-                    finally:
-                        try:
-                            if conn is not None:
-                                conn.close()
-                        except Exception:
-                            pass
+                valid_ids = _valid_dentist_ids(_db_path("users.db"))
                 q = q.filter(CalendarEvent.profissional_id.is_not(None))
                 if valid_ids:
-                    q = q.filter(~CalendarEvent.profissional_id.in_(list(valid_ids)))
+                    q = q.filter(CalendarEvent.profissional_id.not_in(list(valid_ids)))
         except Exception:
             pass
     query_text = (request.args.get("q") or "").strip()
     if query_text:
         q = _apply_query_filters(q, query_text)
     try:
-        events = q.all()
-        if not events:
-            return jsonify({"min": None, "max": None, "count": 0})
-        starts = [e.start for e in events if e.start]
-        ends = [e.end for e in events if e.end]
-        min_start = min(starts) if starts else None
-        max_end = max(ends) if ends else None
-        return jsonify({"min": min_start, "max": max_end, "count": len(events)})
+        # agregação no SQL: uma linha, sem carregar os eventos
+        # (NULLIF: valores vazios ficam fora de min/max, como antes)
+        row = q.with_entities(
+            func.min(func.nullif(CalendarEvent.start, "")),
+            func.max(func.nullif(CalendarEvent.end, "")),
+            func.count(CalendarEvent.id),
+        ).one()
+        return _json({"min": row[0], "max": row[1], "count": row[2] or 0})
     except Exception:
         return jsonify({"min": None, "max": None, "count": 0})
 
@@ -530,11 +763,13 @@ def update_event_color():
     data = request.get_json() or {}
     event_id = data.get("id")
     color = data.get("color")
-    event = db.session.get(CalendarEvent, event_id)
-    if not event:
-        return jsonify({"status": "error", "message": "Event not found"}), 404
-    event.color = color
+    # UPDATE direto: sem SELECT nem objeto ORM para trocar uma coluna
+    result = db.session.execute(
+        update(CalendarEvent).where(CalendarEvent.id == event_id).values(color=color)
+    )
     db.session.commit()
+    if not result.rowcount:
+        return jsonify({"status": "error", "message": "Event not found"}), 404
     return jsonify({"status": "success", "color": color})
 
 
@@ -543,11 +778,12 @@ def update_event_notes():
     data = request.get_json() or {}
     event_id = data.get("id")
     notes = data.get("notes", "")
-    event = db.session.get(CalendarEvent, event_id)
-    if not event:
-        return jsonify({"status": "error", "message": "Event not found"}), 404
-    event.notes = notes
+    result = db.session.execute(
+        update(CalendarEvent).where(CalendarEvent.id == event_id).values(notes=notes)
+    )
     db.session.commit()
+    if not result.rowcount:
+        return jsonify({"status": "error", "message": "Event not found"}), 404
     return jsonify({"status": "success", "notes": notes})
 
 
@@ -556,53 +792,17 @@ def listar_dentistas():
     db_path = _db_path("users.db")
     dentists = []
     if os.path.exists(db_path):
-        conn = sqlite3.connect(db_path)
-        conn.row_factory = sqlite3.Row
-        try:
-            cur = conn.cursor()
-            cur.execute("PRAGMA table_info(users)")
-            cols = [row[1] for row in cur.fetchall()]
-            if "id" in cols:
-                name_candidates = [
-                    "nome_profissional",
-                    "nome",
-                    "name",
-                    "full_name",
-                    "username",
-                ]
-                name_col = (
-                    next(
-                        (c for c in name_candidates if c in cols),
-                        None,
-                    )
-                    or "id"
-                )
-                color_col = "color" if "color" in cols else ("cor" if "cor" in cols else None)
-                sel_cols = ["id", name_col] + ([color_col] if color_col else [])
-                conditions: list[str] = []
-                if "is_active" in cols:
-                    conditions.append("is_active = 1")
-                if "cargo" in cols:
-                    conditions.append("cargo IN ('dentista','admin')")
-                where = (" WHERE " + " AND ".join(conditions)) if conditions else ""
-                q = "SELECT " f"{', '.join(sel_cols)} " f"FROM users{where} ORDER BY {name_col}"
-                cur.execute(q)
-                for r in cur.fetchall():
-                    did = r[0]
-                    name = r[1]
-                    color_val = r[2] if color_col else None
+        dentists_sql, has_color, _ = _users_sql(db_path)
+        if dentists_sql:
+            with _users_engine(db_path).connect() as conn:
+                for r in conn.exec_driver_sql(dentists_sql):
                     dentists.append(
                         {
-                            "id": did,
-                            "nome": name,
-                            "color": color_val,
+                            "id": r[0],
+                            "nome": r[1],
+                            "color": r[2] if has_color else None,
                         }
                     )
-        finally:
-            try:
-                conn.close()
-            except Exception:
-                pass
     etag = f"{int(os.path.getmtime(db_path)) if os.path.exists(db_path) else 0}" f":{len(dentists)}"
     inm = request.headers.get("If-None-Match")
     headers = {"Cache-Control": "public, max-age=300", "ETag": etag}
@@ -614,14 +814,80 @@ def listar_dentistas():
     return resp
 
 
+def _pacientes_engine() -> Engine:
+    """Engine de pacientes.db criado uma vez por app (em app.extensions),
+    não a cada requisição de /pacientes, /buscar_nomes e /buscar_telefone.
+    QueuePool: cada thread usa a sua conexão, reaproveitada entre requisições."""
+    engine = current_app.extensions.get("agenda_pacientes_engine")
+    if engine is None:
+        engine = create_engine(
+            f"sqlite:///{_db_path('pacientes.db')}",
+            connect_args={"check_same_thread": False},
+        )
+        apply_sqlite_pragmas(engine)
+        current_app.extensions["agenda_pacientes_engine"] = engine
+        _ensure_pacientes_fts(engine)
+    return engine
+
+
+_PACIENTES_FTS_DDL = {
+    "pacientes_fts": (
+        "CREATE VIRTUAL TABLE IF NOT EXISTS pacientes_fts USING fts5("
+        "nome, content='pacientes', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    ),
+    "pacientes_fts_ai": (
+        "CREATE TRIGGER IF NOT EXISTS pacientes_fts_ai AFTER INSERT ON pacientes "
+        "BEGIN INSERT INTO pacientes_fts(rowid, nome) VALUES (new.id, new.nome); END"
+    ),
+    "pacientes_fts_ad": (
+        "CREATE TRIGGER IF NOT EXISTS pacientes_fts_ad AFTER DELETE ON pacientes "
+        "BEGIN INSERT INTO pacientes_fts(pacientes_fts, rowid, nome) "
+        "VALUES ('delete', old.id, old.nome); END"
+    ),
+    "pacientes_fts_au": (
+        "CREATE TRIGGER IF NOT EXISTS pacientes_fts_au AFTER UPDATE OF nome ON pacientes "
+        "BEGIN INSERT INTO pacientes_fts(pacientes_fts, rowid, nome) "
+        "VALUES ('delete', old.id, old.nome); "
+        "INSERT INTO pacientes_fts(rowid, nome) VALUES (new.id, new.nome); END"
+    ),
+}
+
+
+def _ensure_pacientes_fts(engine: Engine) -> None:
+    """Cria o índice FTS5 de nomes usado por /buscar_nomes, se faltar.
+
+    Tabela de conteúdo externo (pacientes) mantida em sincronia por
+    triggers. O 'rebuild' (varre pacientes sob lock de escrita) só roda
+    quando a tabela ou algum trigger acabou de ser criado; com tudo já
+    presente, basta uma consulta ao sqlite_master. Se o SQLite não tiver
+    FTS5, nada é criado e a busca continua via LIKE. Best-effort.
+    """
+    try:
+        with engine.connect() as conn:
+            existing = set(
+                conn.exec_driver_sql(
+                    "SELECT name FROM sqlite_master WHERE name IN "
+                    "('pacientes_fts', 'pacientes_fts_ai', 'pacientes_fts_ad', "
+                    "'pacientes_fts_au')"
+                ).scalars()
+            )
+        if existing >= _PACIENTES_FTS_DDL.keys():
+            return
+        with engine.begin() as conn:
+            for ddl in _PACIENTES_FTS_DDL.values():
+                conn.exec_driver_sql(ddl)
+            conn.exec_driver_sql("INSERT INTO pacientes_fts(pacientes_fts) VALUES('rebuild')")
+    except Exception:
+        pass
+
+
 @bp.route("/pacientes")
 def listar_pacientes():
-    engine = create_engine(f"sqlite:///{_db_path('pacientes.db')}")
-    with engine.connect() as conn:
-        query = "SELECT id, nome FROM pacientes ORDER BY nome"
-        result = conn.execute(text(query))
+    with _pacientes_engine().connect() as conn:
+        result = conn.exec_driver_sql("SELECT id, nome FROM pacientes ORDER BY nome")
         pacientes = [{"id": row[0], "nome": row[1]} for row in result]
-    return jsonify(pacientes)
+    return _json(pacientes)
 
 
 @bp.route("/buscar_nomes")
@@ -630,21 +896,29 @@ def buscar_nomes():
     nomes: list[str] = []
     if query and len(query) >= 1:
         try:
-            conn = sqlite3.connect(_db_path("pacientes.db"))
-            cursor = conn.cursor()
-            cursor.execute(
-                (
-                    "SELECT nome FROM pacientes "
-                    "WHERE (nome LIKE ? COLLATE NOCASE) "
-                    "OR (nome LIKE ? COLLATE NOCASE) "
-                    "ORDER BY nome LIMIT 20"
-                ),
-                (f"{query}%", f"% {query}%"),
-            )
-            for row in cursor.fetchall():
-                if row[0]:
-                    nomes.append(row[0])
-            conn.close()
+            with _pacientes_engine().connect() as conn:
+                try:
+                    # Índice FTS5: prefixo em qualquer palavra do nome
+                    # (cobre os dois padrões LIKE abaixo) sem varrer a tabela.
+                    fts_query = '"' + query.replace('"', '""') + '"*'
+                    rows = conn.exec_driver_sql(
+                        "SELECT nome FROM pacientes_fts "
+                        "WHERE pacientes_fts MATCH ? "
+                        "ORDER BY rank LIMIT 20",
+                        (fts_query,),
+                    ).fetchall()
+                except Exception:
+                    # FTS5 indisponível (ou tabela ainda não criada): LIKE
+                    rows = conn.exec_driver_sql(
+                        (
+                            "SELECT nome FROM pacientes "
+                            "WHERE (nome LIKE ? COLLATE NOCASE) "
+                            "OR (nome LIKE ? COLLATE NOCASE) "
+                            "ORDER BY nome LIMIT 20"
+                        ),
+                        (f"{query}%", f"% {query}%"),
+                    ).fetchall()
+                nomes = [row[0] for row in rows if row[0]]
         except Exception as e:
             current_app.logger.warning("Erro ao buscar pacientes: %s", e)
     return jsonify(nomes[:20])
@@ -656,20 +930,16 @@ def buscar_telefone():
     if not nome:
         return jsonify({"telefone": None})
     try:
-        conn = sqlite3.connect(_db_path("pacientes.db"))
-        cursor = conn.cursor()
-        cursor.execute(
-            ("SELECT celular FROM pacientes WHERE LOWER(nome) = LOWER(?) " "LIMIT 1"),
-            (nome,),
-        )
-        result = cursor.fetchone()
-        if not result:
-            cursor.execute(
-                ("SELECT celular FROM pacientes " "WHERE LOWER(nome) LIKE LOWER(?) " "LIMIT 1"),
-                (f"%{nome}%",),
-            )
-            result = cursor.fetchone()
-        conn.close()
+        with _pacientes_engine().connect() as conn:
+            result = conn.exec_driver_sql(
+                ("SELECT celular FROM pacientes WHERE LOWER(nome) = LOWER(?) " "LIMIT 1"),
+                (nome,),
+            ).fetchone()
+            if not result:
+                result = conn.exec_driver_sql(
+                    ("SELECT celular FROM pacientes " "WHERE LOWER(nome) LIKE LOWER(?) " "LIMIT 1"),
+                    (f"%{nome}%",),
+                ).fetchone()
         if result and result[0]:
             return jsonify({"telefone": result[0]})
         return jsonify({"telefone": None})
@@ -681,6 +951,39 @@ def buscar_telefone():
 # ===== Invertexto Holidays integration =====
 
 
+def _holiday_str(value) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _holiday_rows(items: list, year: int, state: str | None) -> list[dict]:
+    """Linhas de holidays a partir dos itens da API; itens que não sejam
+    objetos ou sem data/nome são ignorados. Datas repetidas (ex.: feriado
+    nacional e estadual no mesmo dia) mantêm só a primeira ocorrência, pois
+    date é a PK e o executemany falharia por inteiro."""
+    seen: set[str] = set()
+    rows = []
+    for it in items:
+        if not isinstance(it, dict):
+            continue
+        date = str(it.get("date") or "").strip()
+        name = _holiday_str(it.get("name"))
+        if not date or not name or date in seen:
+            continue
+        seen.add(date)
+        rows.append(
+            {
+                "date": date,
+                "name": name,
+                "type": _holiday_str(it.get("type")) or None,
+                "level": _holiday_str(it.get("level")) or None,
+                "state": state,
+                "year": year,
+                "source": "invertexto",
+            }
+        )
+    return rows
+
+
 @bp.route("/holidays/refresh", methods=["POST"])
 def holidays_refresh():
     """Fetch holidays from Invertexto and upsert into local DB.
@@ -714,7 +1017,7 @@ def holidays_refresh():
         params["state"] = state
     try:
         headers = {"Authorization": f"Bearer {token}"}
-        r = requests.get(url, params=params, headers=headers, timeout=15)
+        r = _http_session().get(url, params=params, headers=headers, timeout=15)
         if r.status_code != 200:
             msg = f"Erro {r.status_code} da API Invertexto"
             if r.status_code == 401:
@@ -730,49 +1033,34 @@ def holidays_refresh():
                 jsonify({"status": "error", "message": "Resposta inesperada"}),
                 502,
             )
-        # Replace holidays for this year (any state) to avoid PK conflicts
+        rows = _holiday_rows(items, year, state)
+        # Replace holidays for this year (any state) to avoid PK conflicts.
+        # DELETE + INSERT numa só transação (um commit): se a inserção
+        # falhar, o rollback devolve os feriados antigos.
         try:
             q = Holiday.query.filter(Holiday.year == year)
             q.delete(synchronize_session=False)
+            if rows:
+                # um executemany, sem unit-of-work do ORM por feriado
+                db.session.execute(insert(Holiday), rows)
             db.session.commit()
         except Exception:
             db.session.rollback()
+            current_app.logger.exception("Falha ao gravar feriados de %s", year)
             return (
                 jsonify(
                     {
                         "status": "error",
-                        "message": "Falha ao limpar dados antigos",
+                        "message": "Falha ao gravar feriados",
                     }
                 ),
                 500,
             )
-        count = 0
-        for it in items:
-            try:
-                date = str(it.get("date") or "").strip()
-                name = (it.get("name") or "").strip()
-                htype = (it.get("type") or "").strip() or None
-                level = (it.get("level") or "").strip() or None
-                if not date or not name:
-                    continue
-                rec = Holiday()
-                rec.date = date
-                rec.name = name
-                rec.type = htype
-                rec.level = level
-                rec.state = state
-                rec.year = year
-                rec.source = "invertexto"
-                db.session.add(rec)
-                count += 1
-            except Exception:
-                continue
-        db.session.commit()
         try:
             _invalidate_holidays_cache()
         except Exception:
             pass
-        return jsonify({"status": "success", "count": count})
+        return jsonify({"status": "success", "count": len(rows)})
     except Exception as e:
         return (
             jsonify(
@@ -785,32 +1073,96 @@ def holidays_refresh():
         )
 
 
+def _holidays_caches():
+    """(range, year): caches LRU de feriados do app atual, em app.extensions.
+
+    Um cache por app, pois consultam o db.session dele (create_app da Agenda
+    memoriza até 8 apps). LRU limitado; ttl_bucket na chave expira as
+    entradas (TTL) e gen (_HOLIDAYS_GEN) as invalida após um refresh.
+    Retornam (feriados, instante em que foram lidos).
+    """
+    caches = current_app.extensions.get("agenda_holidays_cache")
+    if caches is not None:
+        return caches
+
+    @functools.lru_cache(maxsize=_HOLIDAYS_CACHE_SIZE)
+    def year_data(year: int, ttl_bucket: int, gen: int) -> tuple[tuple[dict, ...], float]:
+        rows = db.session.query(Holiday).options(raiseload("*")).filter(Holiday.year == year).all()
+        return tuple(h.to_dict() for h in rows), time.time()
+
+    @functools.lru_cache(maxsize=_HOLIDAYS_CACHE_SIZE)
+    def range_data(
+        start: str, end: str, ttl_bucket: int, gen: int
+    ) -> tuple[tuple[dict, ...], float]:
+        if start[:4] == end[:4]:
+            # intervalo dentro de um ano (navegar pelo calendário): recorta o
+            # cache do ano em Python em vez de outra consulta por datas
+            data, cached_at = year_data(int(start[:4]), ttl_bucket, gen)
+            return tuple(h for h in data if start <= h["date"] <= end), cached_at
+        rows = (
+            db.session.query(Holiday)
+            .options(raiseload("*"))
+            .filter(Holiday.date >= start)
+            .filter(Holiday.date <= end)
+            .all()
+        )
+        return tuple(h.to_dict() for h in rows), time.time()
+
+    caches = current_app.extensions["agenda_holidays_cache"] = (range_data, year_data)
+    return caches
+
+
+def _holidays_range_data(start: str, end: str) -> tuple[tuple[dict, ...], float]:
+    return _holidays_caches()[0](start, end, _holidays_ttl_bucket(), _HOLIDAYS_GEN)
+
+
+def _holidays_year_data(year: int) -> tuple[tuple[dict, ...], float]:
+    return _holidays_caches()[1](year, _holidays_ttl_bucket(), _HOLIDAYS_GEN)
+
+
+def _holidays_response(key: str, data: tuple[dict, ...], cached_at: float):
+    # ETag = chave do cache + instante em que foi preenchido
+    etag = f'"{key}:{cached_at:.6f}"'
+    # max-age = o que resta do bucket de TTL do cache do servidor, para o
+    # cliente não guardar a resposta além da próxima renovação aqui
+    now = int(time.time())
+    remaining = (now // _HOLIDAYS_TTL_SECONDS + 1) * _HOLIDAYS_TTL_SECONDS - now
+    headers = {
+        "Cache-Control": f"public, max-age={max(1, remaining)}",
+        "ETag": etag,
+        "Last-Modified": http_date(cached_at),
+    }
+    if request.headers.get("If-None-Match") == etag:
+        return "", 304, headers
+    resp = _json(data)
+    for k, v in headers.items():
+        resp.headers[k] = v
+    return resp
+
+
+def _is_iso_date(s: str) -> bool:
+    # formato YYYY-MM-DD por fatias, sem strptime: a comparação no SQLite é
+    # por string e datas impossíveis só não casam com nenhum feriado
+    return (
+        len(s) == 10
+        and s.isascii()
+        and s[4] == "-"
+        and s[7] == "-"
+        and s[:4].isdigit()
+        and s[5:7].isdigit()
+        and s[8:].isdigit()
+    )
+
+
 @bp.route("/holidays/range")
 def holidays_in_range():
     """Return holidays between start and end (inclusive)."""
     start = (request.args.get("start") or "").strip()
     end = (request.args.get("end") or "").strip()
-    if not start or not end:
-        return jsonify([])
-    try:
-        datetime.strptime(start, "%Y-%m-%d")
-        datetime.strptime(end, "%Y-%m-%d")
-    except Exception:
+    if not (_is_iso_date(start) and _is_iso_date(end)):
         return jsonify([])
-    key = (start, end)
-    now = _utcnow()
-    cached = _HOLIDAYS_RANGE_CACHE.get(key)
-    cached_at = _ensure_aware_utc(cached.get("at") if cached else None) if cached else None
-    if cached and cached_at and (now - cached_at) <= timedelta(seconds=_HOLIDAYS_TTL_SECONDS):
-        resp = jsonify(cached.get("data", []))
-        resp.headers["Cache-Control"] = f"public, max-age={_HOLIDAYS_TTL_SECONDS}"
-        return resp
-    rows = Holiday.query.filter(Holiday.date >= start).filter(Holiday.date <= end).all()
-    data = [h.to_dict() for h in rows]
-    _HOLIDAYS_RANGE_CACHE[key] = {"data": data, "at": now}
-    resp = jsonify(data)
-    resp.headers["Cache-Control"] = f"public, max-age={_HOLIDAYS_TTL_SECONDS}"
-    return resp
+    data, cached_at = _holidays_range_data(start, end)
+    return _holidays_response(f"{start}:{end}", data, cached_at)
 
 
 @bp.route("/holidays/year")
@@ -823,19 +1175,8 @@ def holidays_by_year():
         year = 0
     if year <= 0:
         return jsonify([])
-    now = _utcnow()
-    cached = _HOLIDAYS_YEAR_CACHE.get(year)
-    cached_at = _ensure_aware_utc(cached.get("at") if cached else None) if cached else None
-    if cached and cached_at and (now - cached_at) <= timedelta(seconds=_HOLIDAYS_TTL_SECONDS):
-        resp = jsonify(cached.get("data", []))
-        resp.headers["Cache-Control"] = f"public, max-age={_HOLIDAYS_TTL_SECONDS}"
-        return resp
-    rows = Holiday.query.filter(Holiday.year == year).all()
-    data = [h.to_dict() for h in rows]
-    _HOLIDAYS_YEAR_CACHE[year] = {"data": data, "at": now}
-    resp = jsonify(data)
-    resp.headers["Cache-Control"] = f"public, max-age={_HOLIDAYS_TTL_SECONDS}"
-    return resp
+    data, cached_at = _holidays_year_data(year)
+    return _holidays_response(str(year), data, cached_at)
 
 
 @bp.route("/cache/clear", methods=["POST"])  # lightweight noop for client hard refresh
@@ -2577,6 +2577,16 @@ function __initAgendaApp() {
                 }
                 statusEl.textContent = 'Atualizando feriados...';
                 const maybeToken = (tokenInput.value || '').trim();
+                // O servidor pode enfileirar o refresh (202 + task_id):
+                // nesse caso consulta o status até concluir.
+                const waitRefresh = (j) => {
+                    if (!j || j.status !== 'queued' || !j.task_id) return j;
+                    const poll = () => new Promise(res => setTimeout(res, 1000))
+                        .then(() => fetch(BASE + '/holidays/refresh/status/' + encodeURIComponent(j.task_id)))
+                        .then(r => r.json())
+                        .then(t => (t && (t.status === 'queued' || t.status === 'running')) ? poll() : t);
+                    return poll();
+                };
                 const doRefresh = () => fetch(BASE + '/holidays/refresh', {
                     method: 'POST',
                     headers: {
@@ -2586,7 +2596,7 @@ function __initAgendaApp() {
                         year: year,
                         state: uf || undefined
                     })
-                }).then(r => r.json()).then(j => {
+                }).then(r => r.json()).then(waitRefresh).then(j => {
                     if (j && j.status === 'success') {
                         statusEl.textContent = `Atualizado. ${j.count || 0} registros.`;
                         // Invalidate year cache and rebuild for current view
@@ -1,35 +1,256 @@
+import functools
+import hashlib
+import importlib
+import json
 import os
-import secrets  # Add secrets
+import threading
+import time
 from datetime import date, datetime, timezone  # Add timezone
-from typing import Union  # Add Union for Python < 3.10 compatibility if needed
+from types import SimpleNamespace
+from typing import TYPE_CHECKING, Union  # Add Union for Python < 3.10 compatibility if needed
 
-from flask import Flask, render_template
+from flask import Flask, g, render_template, request
+from jinja2 import FileSystemBytecodeCache
 from markupsafe import Markup, escape
+from sqlalchemy import make_url
 
-from app.models.user import User
-
-# Import AI Assistant blueprint but with lazy route handling
-from app.routes.ai_assistant import ai_assistant_bp
-from app.routes.atestados import atestados_bp  # Adicionando o novo blueprint de atestados
-
-# Import blueprints and models at the top level
-from app.routes.auth import auth
-from app.routes.cro import cro_bp  # Adicionando o novo blueprint de CRO
-from app.routes.documentos import documentos_bp  # Adicionando o novo blueprint de documentos
-from app.routes.main import main
-from app.routes.pacientes import pacientes
-from app.routes.receitas import receitas  # Adicionando o novo blueprint de receitas
-from app.routes.tratamentos import tratamentos
-from app.routes.users import users
+from agenda.db import apply_sqlite_pragmas
 
 # Import extensions from the new extensions.py file
 from .extensions import db, login_manager, mobility
-from .multidb import multidb
+from .multidb import is_sqlite_memory, multidb
+
+if TYPE_CHECKING:
+    from app.models.user import User
+
+# Diretório instance (irmão do pacote app), onde ficam todos os bancos SQLite
+_INSTANCE_PATH = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "instance"))
+
+# (chave de config, variável de ambiente, URI padrão) de cada banco. As URIs
+# padrão ficam todas em instance/ e são montadas uma vez, não a cada create_app.
+_DATABASE_URIS: list[tuple[str, str, str]] = [
+    (key, env, f"sqlite:///{os.path.join(_INSTANCE_PATH, name + '.db')}")
+    for key, env, name in (
+        ("SQLALCHEMY_DATABASE_URI", "DATABASE_URL", "app"),
+        ("USERS_DATABASE_URI", "USERS_DATABASE_URI", "users"),
+        ("PACIENTES_DATABASE_URI", "PACIENTES_DATABASE_URI", "pacientes"),
+        ("TRATAMENTOS_DATABASE_URI", "TRATAMENTOS_DATABASE_URI", "tratamentos"),
+        ("RECEITAS_DATABASE_URI", "RECEITAS_DATABASE_URI", "receitas"),
+        ("CALENDARIO_DATABASE_URI", "CALENDARIO_DATABASE_URI", "calendario"),
+    )
+]
+
+# Blueprints registrados em create_app: (módulo, atributo, url_prefix).
+# Os módulos só são importados dentro de create_app, evitando carregar todas
+# as rotas (e seus modelos) ao simplesmente importar o pacote ``app``.
+BLUEPRINTS: list[tuple[str, str, str]] = [
+    ("app.routes.auth", "auth", "/auth"),
+    ("app.routes.main", "main", "/"),
+    ("app.routes.pacientes", "pacientes", "/pacientes"),
+    ("app.routes.tratamentos", "tratamentos", "/tratamentos"),
+    ("app.routes.users", "users", "/users"),
+    ("app.routes.receitas", "receitas", "/receitas"),
+    ("app.routes.cro", "cro_bp", "/cro"),
+    ("app.routes.atestados", "atestados_bp", "/atestados"),
+    ("app.routes.documentos", "documentos_bp", "/documentos"),
+    # IA: o próprio módulo adia os imports pesados até a primeira requisição
+    ("app.routes.ai_assistant", "ai_assistant_bp", "/ai"),
+]
+
+
+# Cache de bytecode Jinja em disco (diretório temporário por usuário): o
+# template só é recompilado quando o arquivo-fonte muda.
+_JINJA_BYTECODE_CACHE = FileSystemBytecodeCache()
+
+# Troca "," <-> "." numa única passada: 1,234.50 -> 1.234,50
+_CURRENCY_TABLE = str.maketrans({",": ".", ".": ","})
+_BR = Markup("<br>")
+
+
+# Custom Jinja filter for date formatting
+def format_date_filter(value: Union[datetime, date], format: str = "%d/%m/%Y") -> str:
+    if value and isinstance(value, (datetime, date)):
+        return value.strftime(format)
+    return str(value)
+
+
+# Custom Jinja filter to convert newlines to <br>
+def nl2br(value: str) -> str:
+    """
+    Converte quebras de linha (\n) em <br> para exibição segura em HTML.
+    """
+    if not value:
+        return ""
+    # escape() já devolve Markup; com Markup("<br>") o replace não o escapa
+    return escape(value).replace("\n", _BR)
+
+
+@functools.lru_cache(maxsize=2048)
+def _file_exists_cached(abs_path: str) -> bool:
+    """os.path.exists memoizado para o filtro file_exists (assets estáticos,
+    fora de static/uploads)."""
+    return os.path.exists(abs_path)
+
+
+def _pool_options(uri: str, engine_options: dict) -> dict:
+    return {} if is_sqlite_memory(uri) else engine_options
+
+
+def _agenda_schema_signature(sa) -> str:
+    """Hash dos binds/tabelas/colunas mapeados em ``sa`` (muda se o esquema mudar)."""
+    parts = sorted(
+        f"{bind}:{table.name}:{','.join(col.name for col in table.columns)}"
+        for bind, metadata in sa.metadatas.items()
+        for table in metadata.tables.values()
+    )
+    return hashlib.md5("\n".join(parts).encode("utf-8")).hexdigest()
+
+
+def _agenda_schema_stale(app: Flask, sa, sentinel: str, signature: str) -> bool:
+    """True se o create_all da Agenda precisa rodar neste boot: assinatura
+    diferente da gravada ou arquivo de algum bind de ``sa`` ausente (ex.:
+    calendario.db apagado com app.db e .agenda_schema intactos)."""
+    binds = app.config.get("SQLALCHEMY_BINDS", {})
+    for bind in sa.metadatas:
+        uri = app.config["SQLALCHEMY_DATABASE_URI"] if bind is None else binds.get(bind)
+        if isinstance(uri, dict):
+            uri = uri.get("url")
+        if not uri:
+            return True
+        url = make_url(uri)
+        if url.get_backend_name() != "sqlite":
+            continue
+        if is_sqlite_memory(uri):
+            return True
+        # caminhos relativos são resolvidos no instance_path (Flask-SQLAlchemy)
+        if not os.path.exists(os.path.join(app.instance_path, url.database)):
+            return True
+    try:
+        with open(sentinel, "r", encoding="utf-8") as f:
+            return f.read().strip() != signature
+    except OSError:
+        return True
+
+
+def _write_sentinel(path: str, signature: str) -> None:
+    try:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(signature)
+    except OSError:
+        # instance/ somente leitura: apenas repete o create_all no próximo boot
+        pass
+
+
+# Bytes aleatórios para os nonces CSP lidos de os.urandom em blocos de 4 KiB
+# (1 syscall a cada 256 nonces). Cada byte é usado uma única vez.
+_NONCE_SIZE = 16
+_NONCE_POOL_SIZE = 4096
+_nonce_lock = threading.Lock()
+_nonce_pool = b""
+_nonce_pos = 0
+
+
+def _nonce_hex() -> str:
+    """Equivalente a secrets.token_hex(16), consumindo o pool de bytes."""
+    global _nonce_pool, _nonce_pos
+    with _nonce_lock:
+        if _nonce_pos + _NONCE_SIZE > len(_nonce_pool):
+            _nonce_pool = os.urandom(_NONCE_POOL_SIZE)
+            _nonce_pos = 0
+        start = _nonce_pos
+        _nonce_pos += _NONCE_SIZE
+        return _nonce_pool[start:_nonce_pos].hex()
+
+
+def _reset_nonce_pool() -> None:
+    """Descarta o pool herdado num fork (ex.: gunicorn --preload): sem isso os
+    workers entregariam a mesma sequência de nonces que o processo pai."""
+    global _nonce_lock, _nonce_pool, _nonce_pos
+    _nonce_lock = threading.Lock()
+    _nonce_pool = b""
+    _nonce_pos = 0
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_nonce_pool)
+
+
+def _request_now() -> datetime:
+    """Instante UTC da requisição atual, lido do relógio uma única vez."""
+    now = g.get("_now")
+    if now is None:
+        now = g._now = datetime.now(timezone.utc)
+    return now
+
+
+def _csp_nonce() -> str:
+    """Nonce CSP da requisição atual, gerado só quando um template o usa."""
+    nonce = g.get("_csp_nonce")
+    if nonce is None:
+        nonce = g._csp_nonce = _nonce_hex()
+    return nonce
+
+
+_AI_SETTINGS_PATH = os.path.join("config", "ai_settings.json")
+_AI_DISABLED = {"ai_available": False, "ai_can_load": False}
+# Último estado lido de ai_settings.json; relido apenas quando o mtime muda
+_AI_CACHE: dict = {"mtime": None, "val": _AI_DISABLED}
+
+
+def _ai_status() -> dict:
+    """Status da IA para os templates: um os.stat por chamada, JSON só se mudou."""
+    try:
+        mtime = os.stat(_AI_SETTINGS_PATH).st_mtime_ns
+    except OSError:
+        return _AI_DISABLED
+    if mtime == _AI_CACHE["mtime"]:
+        return _AI_CACHE["val"]
+    try:
+        with open(_AI_SETTINGS_PATH, "r", encoding="utf-8") as f:
+            settings = json.load(f)
+        ai_enabled = settings.get("ai_enabled", False)
+        val = {"ai_available": ai_enabled, "ai_can_load": ai_enabled}
+    except Exception:
+        val = _AI_DISABLED
+    _AI_CACHE["mtime"] = mtime
+    _AI_CACHE["val"] = val
+    return val
+
+
+# Validade da cópia dos dados da clínica usada pelos templates; alterações
+# pelo ORM invalidam antes disso (ver app.models.clinica).
+CLINICA_CACHE_TTL = 60
+
+
+def _clinica_info(app: Flask) -> SimpleNamespace:
+    """Dados da clínica para os templates, sem um SELECT a cada render.
+
+    Guarda em ``app.extensions["clinica_cache"]`` uma cópia simples das
+    colunas (não a instância ORM, que expira/desanexa ao fim da sessão).
+    """
+    cached = app.extensions.get("clinica_cache")
+    now = time.monotonic()
+    if cached is not None and cached[1] > now:
+        return cached[0]
+
+    from app.models.clinica import Clinica
+
+    clinica = Clinica.get_instance()
+    info = SimpleNamespace(
+        **{col.key: getattr(clinica, col.key) for col in Clinica.__table__.columns}
+    )
+    app.extensions["clinica_cache"] = (info, now + CLINICA_CACHE_TTL)
+    return info
 
 
 def create_app() -> Flask:
     app = Flask(__name__)
 
+    # Bytecode dos templates compartilhado entre instâncias/processos (ex.:
+    # testes que chamam create_app várias vezes). Precisa ser definido antes
+    # do primeiro acesso a app.jinja_env.
+    app.jinja_options = {**app.jinja_options, "bytecode_cache": _JINJA_BYTECODE_CACHE}
+
     # Enable Jinja2 'do' extension
     app.jinja_env.add_extension("jinja2.ext.do")
 
@@ -37,41 +258,39 @@ def create_app() -> Flask:
     app.config["SECRET_KEY"] = os.environ.get("SECRET_KEY", "chave-secreta-temporaria")
 
     # Diretório instance
-    instance_path = os.path.abspath(os.path.join(app.root_path, "..", "instance"))
+    instance_path = _INSTANCE_PATH
 
-    # Configuração dos bancos de dados separados
-    # Use instance folder for the main app.db to keep all DBs under instance
-    app.config["SQLALCHEMY_DATABASE_URI"] = os.environ.get(
-        "DATABASE_URL", f"sqlite:///{os.path.join(instance_path, 'app.db')}"
-    )
-    app.config["USERS_DATABASE_URI"] = os.environ.get(
-        "USERS_DATABASE_URI", f"sqlite:///{os.path.join(instance_path, 'users.db')}"
-    )
-    app.config["PACIENTES_DATABASE_URI"] = os.environ.get(
-        "PACIENTES_DATABASE_URI",
-        f"sqlite:///{os.path.join(instance_path, 'pacientes.db')}",
-    )
-    app.config["TRATAMENTOS_DATABASE_URI"] = os.environ.get(
-        "TRATAMENTOS_DATABASE_URI",
-        f"sqlite:///{os.path.join(instance_path, 'tratamentos.db')}",
-    )
-    app.config["RECEITAS_DATABASE_URI"] = os.environ.get(
-        "RECEITAS_DATABASE_URI",
-        f"sqlite:///{os.path.join(instance_path, 'receitas.db')}",
-    )
-    app.config["CALENDARIO_DATABASE_URI"] = os.environ.get(
-        "CALENDARIO_DATABASE_URI",
-        f"sqlite:///{os.path.join(instance_path, 'calendario.db')}",
-    )
+    # Configuração dos bancos de dados separados (variável de ambiente ou o
+    # arquivo padrão em instance/; ver _DATABASE_URIS)
+    app.config.update({key: os.environ.get(env, default) for key, env, default in _DATABASE_URIS})
 
     # Inicializa extensões
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
+    # Pool por bind: conexões reaproveitadas entre requisições (pragmas via
+    # apply_sqlite_pragmas em cada engine). check_same_thread=False porque a conexão
+    # volta ao pool e pode ser usada por outra thread do servidor; timeout=30
+    # espera o lock de escrita em vez de falhar com "database is locked".
+    engine_options = {
+        "pool_size": 10,
+        "max_overflow": 20,
+        "pool_pre_ping": True,
+        "connect_args": {"check_same_thread": False, "timeout": 30},
+    }
+    # Bancos em memória (sqlite://) usam StaticPool, que não aceita pool_size.
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = _pool_options(
+        app.config["SQLALCHEMY_DATABASE_URI"], engine_options
+    )
+    # Flask-SQLAlchemy só aplica SQLALCHEMY_ENGINE_OPTIONS ao bind padrão;
+    # os demais recebem as opções no formato dict {"url": ..., **opções}.
     app.config["SQLALCHEMY_BINDS"] = {
-        "users": app.config["USERS_DATABASE_URI"],
-        "pacientes": app.config["PACIENTES_DATABASE_URI"],
-        "tratamentos": app.config["TRATAMENTOS_DATABASE_URI"],
-        "receitas": app.config["RECEITAS_DATABASE_URI"],
-        "calendario": app.config["CALENDARIO_DATABASE_URI"],
+        bind: {"url": uri, **_pool_options(uri, engine_options)}
+        for bind, uri in (
+            ("users", app.config["USERS_DATABASE_URI"]),
+            ("pacientes", app.config["PACIENTES_DATABASE_URI"]),
+            ("tratamentos", app.config["TRATAMENTOS_DATABASE_URI"]),
+            ("receitas", app.config["RECEITAS_DATABASE_URI"]),
+            ("calendario", app.config["CALENDARIO_DATABASE_URI"]),
+        )
     }
 
     # Disable CSRF protection completely
@@ -82,9 +301,18 @@ def create_app() -> Flask:
 
     # Inicializa os bancos de dados
     db.init_app(app)  # Initialize the main db instance first
+    with app.app_context():
+        for engine in db.engines.values():
+            apply_sqlite_pragmas(engine)
 
     # Inicializa sistema de múltiplos bancos de dados, passing the main db instance
     multidb.init_app(app, db_instance=db)  # Pass the db instance from extensions
+    # Bancos existentes recebem tabelas/colunas/índices novos dos modelos (ex.:
+    # tratamento.duracao_minutos); uma consulta ao sqlite_master por banco
+    try:
+        multidb.create_all()
+    except Exception as ex:
+        app.logger.exception("Falha ao atualizar o esquema do MultiDB: %s", ex)
 
     # Update the placeholder variables in extensions.py
     from . import extensions
@@ -101,124 +329,96 @@ def create_app() -> Flask:
     login_manager.login_message_category = "info"
 
     # Registra os blueprints
-    app.register_blueprint(auth, url_prefix="/auth")
-    app.register_blueprint(main, url_prefix="/")
-    app.register_blueprint(pacientes, url_prefix="/pacientes")
-    app.register_blueprint(tratamentos, url_prefix="/tratamentos")
-    app.register_blueprint(users, url_prefix="/users")
-    app.register_blueprint(receitas, url_prefix="/receitas")  # Registro do blueprint de receitas
-    app.register_blueprint(cro_bp, url_prefix="/cro")  # Registro do blueprint de CRO
-    app.register_blueprint(
-        atestados_bp, url_prefix="/atestados"
-    )  # Registro do blueprint de atestados
-    app.register_blueprint(
-        documentos_bp, url_prefix="/documentos"
-    )  # Registro do blueprint de documentos
-    app.register_blueprint(
-        ai_assistant_bp, url_prefix="/ai"
-    )  # Registro do blueprint de IA com lazy loading
+    for module_path, attr, url_prefix in BLUEPRINTS:
+        try:
+            module = importlib.import_module(module_path)
+        except ModuleNotFoundError as ex:
+            # Só ignora o próprio módulo ausente (ex.: atestados); dependências
+            # faltando dentro de um blueprint continuam sendo erro.
+            if ex.name != module_path:
+                raise
+            app.logger.warning("Blueprint %s indisponível", module_path)
+            continue
+        app.register_blueprint(getattr(module, attr), url_prefix=url_prefix)
 
     # Integra o módulo de Agenda (calendário) como um blueprint em /agenda
     # Preferimos registrar o blueprint diretamente; se falhar, tentamos via init_agenda.
+    # Em ambos os casos o create_all (que reflete todas as tabelas) só roda
+    # quando o esquema dos modelos mudou desde o último boot (ver .agenda_schema).
+    sentinel = os.path.join(instance_path, ".agenda_schema")
     try:
         from agenda.db import db as agenda_db  # type: ignore
         from agenda.routes import bp as agenda_bp  # type: ignore
 
         agenda_db.init_app(app)
-        app.register_blueprint(agenda_bp, url_prefix="/agenda")
         with app.app_context():
-            try:
-                # Create default-bind tables (e.g., app_settings in app.db)
-                # Calendar-related tables are managed via one-off migration script and not on startup
-                agenda_db.create_all()
-            except Exception:
-                pass
+            for engine in agenda_db.engines.values():
+                apply_sqlite_pragmas(engine)
+        app.register_blueprint(agenda_bp, url_prefix="/agenda")
+        signature = _agenda_schema_signature(agenda_db)
+        if _agenda_schema_stale(app, agenda_db, sentinel, signature):
+            with app.app_context():
+                try:
+                    # Create default-bind tables (e.g., app_settings in app.db)
+                    # Calendar-related tables are managed via one-off migration script and not on startup
+                    agenda_db.create_all()
+                    _write_sentinel(sentinel, signature)
+                except Exception:
+                    pass
     except Exception:
         try:
             from agenda import init_agenda  # type: ignore
 
-            init_agenda(app, url_prefix="/agenda", auto_create_db=True)
+            # Com o Flask-SQLAlchemy do app já registrado, init_agenda reutiliza
+            # esse db; a assinatura cobre os modelos mapeados nele.
+            signature = _agenda_schema_signature(db)
+            create = _agenda_schema_stale(app, db, sentinel, signature)
+            init_agenda(app, url_prefix="/agenda", auto_create_db=create)
+            if create:
+                _write_sentinel(sentinel, signature)
         except Exception as ex:
             try:
                 app.logger.exception("Falha ao inicializar Agenda: %s", ex)
             except Exception:
                 print("Falha ao inicializar Agenda:", ex)
 
-    # Custom Jinja filter for date formatting
-    def format_date_filter(value: Union[datetime, date], format: str = "%d/%m/%Y") -> str:
-        if value and isinstance(value, (datetime, date)):
-            return value.strftime(format)
-        return str(value)
-
     app.jinja_env.filters["date"] = format_date_filter
 
-    # Custom Jinja filter to convert newlines to <br>
-    def nl2br(value: str) -> str:
-        if not value:
-            return ""
-        return Markup(escape(value).replace("\n", "<br>"))
-
     app.jinja_env.filters["nl2br"] = nl2br
 
     @app.context_processor
-    def inject_now() -> dict[str, datetime]:
+    def inject_template_context() -> dict:
         """
-        Injects the current UTC datetime into Jinja2 templates.
-        """
-        return {"now": datetime.now(timezone.utc)}
-
-    @app.context_processor
-    def inject_csp_nonce():
-        """
-        Provides a Content Security Policy (CSP) nonce for Jinja2 templates.
-        """
-        nonce = secrets.token_hex(16)
-        return {"csp_nonce": lambda: nonce}
-
-    @app.context_processor
-    def inject_mobility() -> dict:
-        """
-        Injects mobility information into templates.
-        """
-        from flask import request
-
-        return {"is_mobile": getattr(request, "MOBILE", False)}
-
-    @app.context_processor
-    def inject_ai_status() -> dict:
-        """
-        Injects AI availability status into templates.
-        Checks if AI is enabled and working without heavy imports.
+        Único context processor do app: um dict por render em vez de um por
+        processor. Fornece:
+        - now: datetime UTC da requisição (o mesmo em todos os templates dela);
+        - csp_nonce: nonce CSP, gerado no primeiro uso e mantido em ``g``;
+        - is_mobile: detecção do Flask-Mobility;
+        - ai_available/ai_can_load: status da IA (ai_settings.json);
+        - clinica_global: dados da clínica (None se o banco falhar).
         """
         try:
-            import os
-
-            config_path = os.path.join("config", "ai_settings.json")
-            if os.path.exists(config_path):
-                import json
-
-                with open(config_path, "r", encoding="utf-8") as f:
-                    settings = json.load(f)
-                ai_enabled = settings.get("ai_enabled", False)
-                return {"ai_available": ai_enabled, "ai_can_load": ai_enabled}
-            return {"ai_available": False, "ai_can_load": False}
+            clinica = _clinica_info(app)
         except Exception:
-            return {"ai_available": False, "ai_can_load": False}
-
-    @app.context_processor
-    def inject_endpoint_utils() -> dict:
-        """Expose a helper to check if a Flask endpoint exists."""
-
-        def endpoint_exists(name: str) -> bool:
-            try:
-                return name in app.view_functions
-            except Exception:
-                return False
-
-        return {"endpoint_exists": endpoint_exists}
+            # Se houver erro ao acessar o banco, retorna dados padrão
+            clinica = None
+        context = {
+            "now": _request_now(),
+            "csp_nonce": _csp_nonce,
+            "is_mobile": getattr(request, "MOBILE", False),
+            "clinica_global": clinica,
+        }
+        context.update(_ai_status())
+        return context
+
+    # Helper para checar se um endpoint Flask existe: global fixa do Jinja em
+    # vez de um context processor que recria a closure a cada render.
+    app.jinja_env.globals["endpoint_exists"] = app.view_functions.__contains__
 
     @login_manager.user_loader
-    def load_user(user_id: str) -> Union[User, None]:  # Assuming User model or None
+    def load_user(user_id: str) -> Union["User", None]:  # Assuming User model or None
+        from app.models.user import User
+
         return User.query.get(int(user_id))
 
     # Adiciona função personalizada ao contexto Jinja
@@ -242,28 +442,20 @@ def create_app() -> Flask:
     ) -> str:  # Assuming value is numeric or None
         if value is None:
             return "R$ 0,00"
-        return f"R$ {value:,.2f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return f"R$ {value:,.2f}".translate(_CURRENCY_TABLE)
 
     # Adiciona filtro Jinja para verificar existência de arquivo
-    def file_exists_filter(path):
-        import os
+    uploads_dir = os.path.join(app.root_path, "static", "uploads")
 
+    def file_exists_filter(path):
         base = app.root_path
-        abs_path = os.path.join(base, path) if not os.path.isabs(path) else path
-        return os.path.exists(abs_path)
+        abs_path = os.path.normpath(os.path.join(base, path))
+        if app.debug or os.path.commonpath([abs_path, uploads_dir]) == uploads_dir:
+            # Em desenvolvimento arquivos aparecem/somem o tempo todo, e os
+            # uploads (ex.: logo da clínica) são gravados em tempo de execução
+            return os.path.exists(abs_path)
+        return _file_exists_cached(abs_path)
 
     app.jinja_env.filters["file_exists"] = file_exists_filter
 
-    # Context processor para disponibilizar informações da clínica em todos os templates
-    @app.context_processor
-    def inject_clinica_info():
-        from app.models.clinica import Clinica
-
-        try:
-            clinica = Clinica.get_instance()
-            return {"clinica_global": clinica}
-        except Exception:
-            # Se houver erro ao acessar o banco, retorna dados padrão
-            return {"clinica_global": None}
-
     return app
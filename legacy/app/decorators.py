@@ -9,6 +9,25 @@ from flask_login import current_user, login_user
 
 from app.models.user import User
 
+# Id do admin usado no login automático em modo debug. Guarda-se o id, não o
+# objeto ORM, que ficaria preso a uma sessão já encerrada. Sem admin, o
+# primeiro usuário é usado mas não fica em cache, para que um admin criado
+# depois passe a ser escolhido.
+_DEBUG_USER_ID = None
+
+
+def _debug_user(session):
+    """Usuário do login automático em debug; a busca filtrada só se repete
+    enquanto não houver admin."""
+    global _DEBUG_USER_ID
+    if _DEBUG_USER_ID is not None:
+        user = session.get(User, _DEBUG_USER_ID)
+        if user is not None and user.cargo == "admin":
+            return user
+    user = session.query(User).filter_by(cargo="admin").first()
+    _DEBUG_USER_ID = user.id if user is not None else None
+    return user or session.query(User).first()
+
 
 def admin_required(f):
     """
@@ -48,19 +67,18 @@ def debug_login_optional(f):
             try:
                 from app import extensions
 
-                admin_user = extensions.users_db.query(User).filter_by(cargo="admin").first()
-                if admin_user:
-                    login_user(admin_user)
+                # Sessão da requisição atual (scoped_session por app context)
+                user = _debug_user(extensions.users_db())
+                if user is not None and user.cargo == "admin":
+                    login_user(user)
                     flash("Login automático realizado (modo debug)", "info")
-                else:
-                    # Se não há admin, tenta qualquer usuário
-                    any_user = extensions.users_db.query(User).first()
-                    if any_user:
-                        login_user(any_user)
-                        flash(
-                            f"Login automático realizado com {any_user.username} (modo debug)",
-                            "info",
-                        )
+                elif user is not None:
+                    # Se não há admin, usa qualquer usuário
+                    login_user(user)
+                    flash(
+                        f"Login automático realizado com {user.username} (modo debug)",
+                        "info",
+                    )
             except Exception as e:
                 # Se houver erro no login automático, continua sem autenticação em debug
                 if current_app.debug:
@@ -97,13 +115,10 @@ def debug_admin_optional(f):
             try:
                 from app import extensions
 
-                admin_user = extensions.users_db.query(User).filter_by(cargo="admin").first()
-                if admin_user:
-                    login_user(admin_user)
-                else:
-                    any_user = extensions.users_db.query(User).first()
-                    if any_user:
-                        login_user(any_user)
+                # Sessão da requisição atual (scoped_session por app context)
+                user = _debug_user(extensions.users_db())
+                if user is not None:
+                    login_user(user)
             except Exception:
                 pass
 
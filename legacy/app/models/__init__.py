@@ -1,28 +1,61 @@
 # filepath: a:\programa\prototipo\app\models\__init__.py
 # This file makes Python treat the directory as a package.
 
-# Importa todos os modelos para garantir que eles sejam carregados
-# Essas importações são necessárias para que o SQLAlchemy registre os modelos
-from app.models import atestado, clinica, documento, paciente, receita, tratamento, user  # noqa
+# Os modelos não são mais importados aqui: cada rota importa o módulo de que
+# precisa (ex.: ``from app.models.user import User``) e MultiDB.create_all
+# importa explicitamente os que cria. ``from app.models import X`` continua
+# funcionando via __getattr__, que carrega o submódulo sob demanda.
+import importlib
+from typing import TYPE_CHECKING
 
-# Importa as classes específicas para disponibilizá-las no __all__
-from app.models.atestado import Atestado
-from app.models.clinica import Clinica
-from app.models.documento import Documento
-from app.models.paciente import (
-    Anamnese,
-    Ficha,
-    Financeiro,
-    Historico,
-    Paciente,
-    PlanoTratamento,
-    Procedimento,
-)
-from app.models.receita import Medicamento, ModeloReceita
-from app.models.tratamento import CategoriaTratamento, Tratamento
-from app.models.user import User
+if TYPE_CHECKING:  # apenas para analisadores estáticos/IDEs; nada é importado em runtime
+    from app.models.atestado import Atestado
+    from app.models.clinica import Clinica
+    from app.models.documento import Documento
+    from app.models.paciente import (
+        Anamnese,
+        Ficha,
+        Financeiro,
+        Historico,
+        Paciente,
+        PlanoTratamento,
+        Procedimento,
+    )
+    from app.models.receita import Medicamento, ModeloReceita
+    from app.models.tratamento import CategoriaTratamento, Tratamento
+    from app.models.user import User
 
-# Exportar classes principais para facilitar a importação externa
+_MODEL_MODULES = {
+    "Atestado": "atestado",
+    "Clinica": "clinica",
+    "Documento": "documento",
+    "Paciente": "paciente",
+    "PlanoTratamento": "paciente",
+    "Procedimento": "paciente",
+    "Anamnese": "paciente",
+    "Ficha": "paciente",
+    "Financeiro": "paciente",
+    "Historico": "paciente",
+    "ModeloReceita": "receita",
+    "Medicamento": "receita",
+    "Tratamento": "tratamento",
+    "CategoriaTratamento": "tratamento",
+    "User": "user",
+}
+
+
+def __getattr__(name: str):
+    """Importa o submódulo do modelo pedido no primeiro acesso (PEP 562)."""
+    module = _MODEL_MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f"{__name__}.{module}"), name)
+    globals()[name] = value
+    return value
+
+
+# Exportar classes principais para facilitar a importação externa (lista
+# literal para analisadores estáticos; em runtime os nomes vêm de __getattr__)
 __all__ = [
     "Atestado",
     "Clinica",
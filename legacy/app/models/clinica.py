@@ -1,4 +1,5 @@
-from datetime import datetime
+from flask import current_app, has_app_context
+from sqlalchemy import event
 
 from app.extensions import db
 
@@ -19,8 +20,10 @@ class Clinica(db.Model):
     cidade = db.Column(db.String(100), nullable=True)
     estado = db.Column(db.String(2), nullable=True)
     cnpj = db.Column(db.String(20), nullable=True)
-    data_criacao = db.Column(db.DateTime, default=datetime.utcnow)
-    data_atualizacao = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    data_criacao = db.Column(db.DateTime, default=db.func.now(), server_default=db.func.now())
+    data_atualizacao = db.Column(
+        db.DateTime, default=db.func.now(), server_default=db.func.now(), onupdate=db.func.now()
+    )
 
     def __repr__(self) -> str:
         return f"<Clinica {self.nome}>"
@@ -28,10 +31,20 @@ class Clinica(db.Model):
     @classmethod
     def get_instance(cls):
         """Retorna a única instância de configuração da clínica ou cria uma nova"""
-        clinica = cls.query.first()
+        # Singleton: percorre a PK e para na primeira linha
+        clinica = cls.query.order_by(cls.id).first()
         if not clinica:
             clinica = cls()
             clinica.nome = "OdontoClinic"
             db.session.add(clinica)
             db.session.commit()
         return clinica
+
+
+@event.listens_for(Clinica, "after_insert")
+@event.listens_for(Clinica, "after_update")
+@event.listens_for(Clinica, "after_delete")
+def _invalidate_clinica_cache(mapper, connection, target) -> None:
+    """Descarta a cópia usada por inject_clinica_info ao alterar a clínica."""
+    if has_app_context():
+        current_app.extensions.pop("clinica_cache", None)
@@ -1,6 +1,12 @@
-from datetime import datetime
+import json
 
 from app.extensions import db
+from app.models.paciente import Paciente
+
+try:
+    import orjson  # type: ignore
+except Exception:  # pragma: no cover - optional dep defensive
+    orjson = None  # type: ignore
 
 
 class Documento(db.Model):
@@ -8,17 +14,20 @@ class Documento(db.Model):
     __bind_key__ = "pacientes"  # Usando o mesmo bind do paciente para simplificar
 
     id = db.Column(db.Integer, primary_key=True)
-    paciente_id = db.Column(db.Integer, nullable=False)
+    paciente_id = db.Column(db.Integer, db.ForeignKey("pacientes.id"), nullable=False)
     dentista_id = db.Column(db.Integer, nullable=False)
     tipo_documento = db.Column(
         db.String(50), nullable=False
     )  # Ex: 'autorizacao_imagem', 'interrupcao_tratamento'
     titulo_documento = db.Column(db.String(200), nullable=False)  # Nome amigável do documento
     conteudo_json = db.Column(db.Text, nullable=False)  # Dados específicos em JSON
-    data_emissao = db.Column(db.DateTime, default=datetime.utcnow)
+    data_emissao = db.Column(db.DateTime, default=db.func.now(), server_default=db.func.now())
     local_emissao = db.Column(db.String(100), default="", nullable=False)
     observacoes = db.Column(db.Text, default="")  # Campo opcional para observações
 
+    # Mesmo bind de Paciente: o JOIN evita um SELECT por documento nas listagens
+    paciente = db.relationship(Paciente, lazy="joined", viewonly=True)
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
@@ -26,17 +35,48 @@ class Documento(db.Model):
         return f"<Documento {self.id} - {self.tipo_documento} - Paciente {self.paciente_id}>"
 
     @property
-    def nome_paciente(self):
-        """Retorna o nome do paciente (necessário relacionamento)"""
-        from app.models.paciente import Paciente
+    def conteudo(self) -> dict:
+        """conteudo_json já decodificado (orjson quando disponível).
 
-        paciente = Paciente.query.get(self.paciente_id)
+        O resultado fica em cache na instância junto com o texto de origem,
+        então reatribuir conteudo_json invalida o cache automaticamente.
+        """
+        raw = self.conteudo_json or "{}"
+        cached = self.__dict__.get("_conteudo_cache")
+        if cached is None or cached[0] is not raw:
+            parsed = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            cached = self.__dict__["_conteudo_cache"] = (raw, parsed)
+        return cached[1]
+
+    @classmethod
+    def prefetch_dentistas(cls, documentos) -> None:
+        """Carrega os dentistas de uma lista de documentos numa única consulta.
+
+        User fica em outro banco (bind ``users``), então não há JOIN possível;
+        sem isto ``nome_dentista`` faria um SELECT por documento.
+        """
+        from app.models.user import User
+
+        ids = {doc.dentista_id for doc in documentos}
+        if not ids:
+            return
+        dentistas = {u.id: u for u in User.query.filter(User.id.in_(ids)).all()}
+        for doc in documentos:
+            doc._dentista = dentistas.get(doc.dentista_id)
+
+    @property
+    def nome_paciente(self):
+        """Retorna o nome do paciente (via relacionamento carregado com JOIN)"""
+        paciente = self.paciente
         return paciente.nome if paciente else "Paciente não encontrado"
 
     @property
     def nome_dentista(self):
         """Retorna o nome do dentista (necessário relacionamento)"""
-        from app.models.user import User
+        if "_dentista" in self.__dict__:
+            dentista = self._dentista
+        else:
+            from app.models.user import User
 
-        dentista = User.query.get(self.dentista_id)
+            dentista = db.session.get(User, self.dentista_id)
         return dentista.nome_completo if dentista else "Dentista não encontrado"
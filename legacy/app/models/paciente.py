@@ -1,9 +1,13 @@
-from datetime import datetime
-
 from app.extensions import db
+from app.models.tratamento import Tratamento  # noqa: F401  (alvo de Procedimento.tratamento)
 
 
 class Paciente(db.Model):
+    # A Agenda (agenda/routes.py, _ensure_pacientes_fts) cria em pacientes.db o
+    # índice FTS5 pacientes_fts e os triggers pacientes_fts_ai/_ad/_au nesta
+    # tabela, que o mantêm em sincronia com id e nome. Renomear/remover essas
+    # colunas ou recriar a tabela exige recriar os triggers (apagá-los e a
+    # pacientes_fts faz a Agenda reconstruir o índice no próximo boot).
     __tablename__ = "pacientes"
     __bind_key__ = "pacientes"
 
@@ -21,7 +25,7 @@ class Paciente(db.Model):
     estado = db.Column(db.String(2))
     cep = db.Column(db.String(10))
     profissao = db.Column(db.String(100))
-    data_cadastro = db.Column(db.DateTime, default=datetime.utcnow)
+    data_cadastro = db.Column(db.DateTime, default=db.func.now(), server_default=db.func.now())
 
     # Relações
     ficha = db.relationship(
@@ -59,7 +63,9 @@ class Ficha(db.Model):
     numero_convenio = db.Column(db.String(50))
     alergias = db.Column(db.Text)
     observacoes = db.Column(db.Text)
-    ultima_atualizacao = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    ultima_atualizacao = db.Column(
+        db.DateTime, default=db.func.now(), server_default=db.func.now(), onupdate=db.func.now()
+    )
 
 
 class Anamnese(db.Model):
@@ -75,8 +81,10 @@ class Anamnese(db.Model):
     habitos = db.Column(db.Text)
     problemas_dentarios = db.Column(db.Text)
     ultima_visita_dentista = db.Column(db.String(100))
-    data_preenchimento = db.Column(db.DateTime, default=datetime.utcnow)
-    ultima_atualizacao = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    data_preenchimento = db.Column(db.DateTime, default=db.func.now(), server_default=db.func.now())
+    ultima_atualizacao = db.Column(
+        db.DateTime, default=db.func.now(), server_default=db.func.now(), onupdate=db.func.now()
+    )
 
 
 class PlanoTratamento(db.Model):
@@ -86,7 +94,7 @@ class PlanoTratamento(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     paciente_id = db.Column(db.Integer, db.ForeignKey("pacientes.id"), nullable=False)
     dentista_id = db.Column(db.Integer)  # Apenas o ID, sem relacionamento ORM
-    data_criacao = db.Column(db.DateTime, default=datetime.utcnow)
+    data_criacao = db.Column(db.DateTime, default=db.func.now(), server_default=db.func.now())
     descricao = db.Column(db.Text, nullable=False)
     # Pendente, Em andamento, Concluído, Cancelado
     status = db.Column(db.String(20), default="Pendente")
@@ -140,7 +148,7 @@ class Historico(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     paciente_id = db.Column(db.Integer, db.ForeignKey("pacientes.id"), nullable=False)
     dentista_id = db.Column(db.Integer)  # Apenas o ID, sem relacionamento ORM
-    data = db.Column(db.DateTime, default=datetime.utcnow)
+    data = db.Column(db.DateTime, default=db.func.now(), server_default=db.func.now())
     descricao = db.Column(db.Text, nullable=False)
     procedimentos_realizados = db.Column(db.Text)
     observacoes = db.Column(db.Text)
@@ -153,7 +161,7 @@ class Financeiro(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     paciente_id = db.Column(db.Integer, db.ForeignKey("pacientes.id"), nullable=False)
     plano_id = db.Column(db.Integer, db.ForeignKey("plano_tratamento.id"))
-    data_lancamento = db.Column(db.DateTime, default=datetime.utcnow)
+    data_lancamento = db.Column(db.DateTime, default=db.func.now(), server_default=db.func.now())
     descricao = db.Column(db.String(200), nullable=False)
     valor = db.Column(db.Float, nullable=False)
     tipo = db.Column(db.String(20))  # Crédito ou Débito
@@ -2,7 +2,7 @@
 Este módulo define os modelos relacionados a receitas médicas.
 """
 
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Index, Integer, String, Text
 
 from app.extensions import db
 
@@ -33,11 +33,14 @@ class Medicamento(db.Model):
 
     __tablename__ = "medicamentos"
     __bind_key__ = "receitas"
+    # Busca típica: filtra a categoria e procura o princípio ativo. O índice
+    # composto também atende filtros só por categoria (prefixo à esquerda).
+    __table_args__ = (Index("ix_med_cat_principio", "categoria", "principio_ativo"),)
 
     id = Column(Integer, primary_key=True)
     categoria = Column(String(100), nullable=False)
-    principio_ativo = Column(String(100), nullable=False)
-    nome_referencia = Column(String(100))
+    principio_ativo = Column(String(100), nullable=False, index=True)
+    nome_referencia = Column(String(100), index=True)
     apresentacao = Column(String(100), nullable=False)
     posologia = Column(Text, nullable=False)
     uso = Column(String(50))
@@ -1,7 +1,71 @@
-from datetime import datetime
+import re
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Optional
+
+from sqlalchemy import Integer, cast, func
+from sqlalchemy.ext.hybrid import hybrid_property
+from sqlalchemy.orm import validates
 
 from app.extensions import db
 
+# "30", "30min", "90 minutos", "1:30", "1:30h", "1h30", "1h30m", "2h"
+_DURACAO_RE = re.compile(
+    r"^(?:(?P<h>\d+)\s*"
+    r"(?::\s*(?P<mc>[0-5]\d)\s*(?:h|m|min)?|h\s*(?:(?P<mh>[0-5]?\d)\s*(?:m|min)?)?)"
+    r"|(?P<min>\d+)\s*(?:m|min|minutos?)?)$",
+    re.IGNORECASE,
+)
+# Limite de db.SmallInteger
+_DURACAO_MAX = 32767
+
+
+def duracao_em_minutos(texto: Optional[str]) -> Optional[int]:
+    """Converte uma duração digitada (minutos ou hh:mm) em minutos.
+
+    Retorna None para texto vazio e levanta ValueError se o formato não for
+    reconhecido.
+    """
+    if texto is None or not str(texto).strip():
+        return None
+    match = _DURACAO_RE.match(str(texto).strip())
+    if not match:
+        raise ValueError(f"Duração inválida: {texto!r}")
+    if match["min"] is not None:
+        minutos = int(match["min"])
+    else:
+        minutos = int(match["h"]) * 60 + int(match["mc"] or match["mh"] or 0)
+    if minutos > _DURACAO_MAX:
+        raise ValueError(f"Duração muito longa: {texto!r}")
+    return minutos
+
+
+def preencher_duracao_minutos(conn) -> tuple[int, list[tuple[int, str]]]:
+    """Preenche duracao_minutos a partir da antiga coluna texto duracao_estimada.
+
+    Só toca linhas com duracao_minutos NULL; retorna (linhas preenchidas,
+    [(id, texto)] não reconhecidos). Chamado pelo MultiDB quando a coluna é
+    adicionada a um banco antigo.
+    """
+    colunas = {row[1] for row in conn.exec_driver_sql("PRAGMA table_info(tratamento)")}
+    if "duracao_estimada" not in colunas:
+        return 0, []
+    linhas = conn.exec_driver_sql(
+        "SELECT id, duracao_estimada FROM tratamento "
+        "WHERE duracao_minutos IS NULL AND duracao_estimada IS NOT NULL"
+    ).all()
+    valores, invalidos = [], []
+    for tratamento_id, texto in linhas:
+        try:
+            minutos = duracao_em_minutos(texto)
+        except ValueError:
+            invalidos.append((tratamento_id, texto))
+            continue
+        if minutos is not None:
+            valores.append((minutos, tratamento_id))
+    if valores:
+        conn.exec_driver_sql("UPDATE tratamento SET duracao_minutos = ? WHERE id = ?", valores)
+    return len(valores), invalidos
+
 
 class CategoriaTratamento(db.Model):
     __tablename__ = "categoria_tratamento"
@@ -26,10 +90,44 @@ class Tratamento(db.Model):
     categoria_id = db.Column(db.Integer, db.ForeignKey("categoria_tratamento.id"), nullable=False)
     nome = db.Column(db.String(200), nullable=False)
     descricao = db.Column(db.Text)
-    preco = db.Column(db.Float, nullable=False)
-    duracao_estimada = db.Column(db.String(50))  # Em minutos ou formato hh:mm
-    data_criacao = db.Column(db.DateTime, default=datetime.utcnow)
+    # Valor em reais com 2 casas exatas (Decimal no Python, sem deriva de float)
+    preco = db.Column(db.Numeric(10, 2), nullable=False)
+    # Duração estimada em minutos; bancos antigos ganham a coluna no boot
+    # (MultiDB.create_all), preenchida a partir de duracao_estimada
+    duracao_minutos = db.Column(db.SmallInteger, info={"on_add": preencher_duracao_minutos})
+    data_criacao = db.Column(db.DateTime, default=db.func.now(), server_default=db.func.now())
     ativo = db.Column(db.Boolean, default=True)
 
+    @hybrid_property
+    def preco_centavos(self) -> int:
+        """Preço em centavos (int), para somas e comparações exatas.
+
+        ``preco`` já é gravado em centavos (ver ``_arredondar_preco``), então
+        coincide com a expressão SQL; o arredondamento aqui só cobre linhas
+        antigas ainda com deriva de float.
+        """
+        return int((Decimal(str(self.preco)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+    @preco_centavos.inplace.expression
+    @classmethod
+    def _preco_centavos_expression(cls):
+        return cast(func.round(cls.preco * 100), Integer)
+
+    @validates("preco")
+    def _arredondar_preco(self, key, value):
+        """Arredonda para centavos na atribuição: o SQLite não arredonda
+        Numeric(10, 2) ao gravar, e 150.005 viraria 150.00 na leitura mas
+        15001 em ``preco_centavos`` no SQL."""
+        if value is None:
+            return None
+        return Decimal(str(value)).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+
+    @property
+    def duracao_estimada(self) -> Optional[str]:
+        """Duração formatada para exibição (ex.: "45min")."""
+        if self.duracao_minutos is None:
+            return None
+        return f"{self.duracao_minutos}min"
+
     def __repr__(self):
         return f"<Tratamento {self.nome}>"
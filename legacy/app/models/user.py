@@ -1,3 +1,8 @@
+import hashlib
+import hmac
+from typing import Optional
+
+from flask import current_app, has_app_context
 from flask_login import UserMixin
 from werkzeug.security import check_password_hash, generate_password_hash
 
@@ -17,7 +22,9 @@ class User(UserMixin, db.Model):
     )  # CRO agora é obrigatório para profissionais
     nome_profissional = db.Column(db.String(120), nullable=False)  # Professional name field
     password_hash = db.Column(db.String(256))  # Aumentado para 256
-    cargo = db.Column(db.String(50), nullable=False, default="dentista")  # Novo campo para cargo
+    cargo = db.Column(
+        db.String(50), nullable=False, default="dentista", index=True
+    )  # Novo campo para cargo
     # Backing column for activation state (stored as 'is_active' in DB)
     is_active_db = db.Column("is_active", db.Boolean, default=True, nullable=True)
 
@@ -42,11 +49,52 @@ class User(UserMixin, db.Model):
             self.cro = cro
         self.cargo = cargo
 
-    def set_password(self, password: str) -> None:
-        self.password_hash = generate_password_hash(password)
+    def set_password(self, password: str, method: Optional[str] = None) -> None:
+        """Gera o hash da senha.
+
+        ``method`` (ou ``PASSWORD_HASH_METHOD`` na config do app) aceita o formato
+        do Werkzeug, ex.: "scrypt" ou "pbkdf2:sha256:1" em testes/seeds para
+        evitar o custo do KDF. Sem nenhum dos dois, usa o padrão forte do
+        Werkzeug. check_password não muda: o método fica gravado no hash.
+        """
+        if method is None and has_app_context():
+            method = current_app.config.get("PASSWORD_HASH_METHOD")
+        if method is None:
+            self.password_hash = generate_password_hash(password)
+        else:
+            self.password_hash = generate_password_hash(password, method=method)
 
     def check_password(self, password: str) -> bool:
-        return check_password_hash(self.password_hash, password)
+        parsed = self._parsed_pbkdf2_hash()
+        if parsed is None:
+            # scrypt e outros formatos: deixa o Werkzeug decidir
+            return check_password_hash(self.password_hash, password)
+        hash_name, iterations, salt, digest = parsed
+        computed = hashlib.pbkdf2_hmac(hash_name, password.encode("utf-8"), salt, iterations)
+        return hmac.compare_digest(computed, digest)
+
+    def _parsed_pbkdf2_hash(self) -> Optional[tuple[str, int, bytes, bytes]]:
+        """Decompõe "pbkdf2:<hash>:<iterações>$salt$hex" uma vez por valor de
+        password_hash (cache na instância); None se não for pbkdf2 completo."""
+        raw = self.password_hash
+        cached = self.__dict__.get("_pbkdf2_cache")
+        if cached is not None and cached[0] is raw:
+            return cached[1]
+        parsed = None
+        try:
+            method, salt, hex_digest = raw.split("$", 2)
+            kind, hash_name, iterations = method.split(":")
+            if kind == "pbkdf2":
+                parsed = (
+                    hash_name,
+                    int(iterations),
+                    salt.encode("utf-8"),
+                    bytes.fromhex(hex_digest),
+                )
+        except (AttributeError, ValueError):
+            parsed = None
+        self.__dict__["_pbkdf2_cache"] = (raw, parsed)
+        return parsed
 
     def __repr__(self) -> str:
         return f"<User {self.username}>"
@@ -3,12 +3,75 @@ Este módulo oferece suporte a múltiplos bancos de dados SQLite para a aplicaç
 Contém classes personalizadas para trabalhar com múltiplos bancos de dados SQLAlchemy.
 """
 
-from typing import Optional
+import functools
+from typing import Any, Optional
 
 from flask import Flask
+from flask.globals import app_ctx
 from flask_sqlalchemy import SQLAlchemy  # Assuming db_instance is SQLAlchemy
-from sqlalchemy import Engine, create_engine
+from sqlalchemy import Engine, Table, create_engine, make_url
 from sqlalchemy.orm import Session, scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.schema import CreateColumn
+
+from agenda.db import apply_sqlite_pragmas
+
+# Pool padrão dos engines do MultiDB: conexões reaproveitadas entre
+# requisições; timeout=30 faz o sqlite3 esperar o lock de escrita (WAL) em vez
+# de falhar na hora com "database is locked".
+DEFAULT_ENGINE_OPTIONS: dict[str, Any] = {
+    "pool_size": 8,
+    "max_overflow": 16,
+    "connect_args": {"check_same_thread": False, "timeout": 30},
+}
+
+
+def is_sqlite_memory(uri: str) -> bool:
+    """True para URIs SQLite em memória (sem arquivo; pool fixo de 1 conexão)."""
+    url = make_url(uri)
+    return url.get_backend_name() == "sqlite" and (
+        url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+    )
+
+
+@functools.lru_cache(maxsize=1)
+def _collect_tables() -> dict[str, tuple[Table, ...]]:
+    """Tabelas de cada banco do MultiDB; importa os modelos só na primeira chamada."""
+    from app.models.paciente import (
+        Anamnese,
+        Ficha,
+        Financeiro,
+        Historico,
+        Paciente,
+        PlanoTratamento,
+        Procedimento,
+    )
+    from app.models.receita import Medicamento, ModeloReceita
+    from app.models.tratamento import CategoriaTratamento, Tratamento
+    from app.models.user import User
+
+    models_by_bind = {
+        "users": (User,),
+        "pacientes": (
+            Paciente,
+            Ficha,
+            Anamnese,
+            PlanoTratamento,
+            Procedimento,
+            Historico,
+            Financeiro,
+        ),
+        "tratamentos": (CategoriaTratamento, Tratamento),
+        "receitas": (Medicamento, ModeloReceita),
+    }
+    return {
+        name: tuple(model.__table__ for model in models) for name, models in models_by_bind.items()
+    }
+
+
+def _app_ctx_id() -> int:
+    """Identificador do app context atual, usado como escopo das sessões."""
+    return id(app_ctx._get_current_object())  # type: ignore[attr-defined]
 
 
 class MultiDB:
@@ -39,6 +102,7 @@ class MultiDB:
         """
         self.app = app
         self.db_instance = db_instance
+        app.teardown_appcontext(self._remove_sessions)
 
         # Configurar bancos de dados separados
         self.configure_db("users", app.config.get("USERS_DATABASE_URI", "sqlite:///users.db"))
@@ -54,72 +118,93 @@ class MultiDB:
             "receitas", app.config.get("RECEITAS_DATABASE_URI", "sqlite:///receitas.db")
         )
 
-    def configure_db(self, name: str, uri: str) -> None:
+    def configure_db(self, name: str, uri: str, **engine_options: Any) -> None:
         """
         Configura um banco de dados individual.
 
         Args:
             name: Nome do banco de dados
             uri: URI de conexão SQLAlchemy
+            **engine_options: Opções extras de create_engine (pool_size,
+                max_overflow, ...); têm precedência sobre
+                SQLALCHEMY_ENGINE_OPTIONS e DEFAULT_ENGINE_OPTIONS.
         """
-        self.engines[name] = create_engine(uri)
+        # Mesmo pool/connect_args e PRAGMAs (WAL etc.) dos binds do Flask-SQLAlchemy
+        options = dict(DEFAULT_ENGINE_OPTIONS)
+        if self.app:
+            options.update(self.app.config.get("SQLALCHEMY_ENGINE_OPTIONS", {}))
+        options.update(engine_options)
+        if is_sqlite_memory(uri):
+            # :memory: existe por conexão: uma única conexão compartilhada mantém
+            # tabelas e PRAGMAs (pool_size/max_overflow não se aplicam aqui)
+            options = {"poolclass": StaticPool, "connect_args": {"check_same_thread": False}}
+        self.engines[name] = create_engine(uri, **options)
+        apply_sqlite_pragmas(self.engines[name])
+        # Uma sessão por app context (como o Flask-SQLAlchemy), descartada em
+        # _remove_sessions ao fim de cada requisição.
         self.sessions[name] = scoped_session(
-            sessionmaker(autocommit=False, autoflush=False, bind=self.engines[name])
+            sessionmaker(autocommit=False, autoflush=False, bind=self.engines[name]),
+            scopefunc=_app_ctx_id,
         )
 
     def create_all(self) -> None:
-        """Cria todas as tabelas em todos os bancos de dados."""
+        """Cria as tabelas, colunas e índices que faltam em todos os bancos."""
         if not self.db_instance:
             raise RuntimeError(
                 "SQLAlchemy instance not provided to MultiDB. " "Call init_app with db_instance."
             )
 
-        from app.models.paciente import (
-            Anamnese,
-            Ficha,
-            Financeiro,
-            Historico,
-            Paciente,
-            PlanoTratamento,
-            Procedimento,
-        )
-        from app.models.receita import Medicamento, ModeloReceita
-        from app.models.tratamento import CategoriaTratamento, Tratamento
-        from app.models.user import User
-
-        # Cria tabelas no banco de dados de usuários
-        self.db_instance.Model.metadata.create_all(
-            bind=self.engines["users"], tables=[t.__table__ for t in [User]]
-        )
-
-        # Cria tabelas no banco de dados de pacientes
-        self.db_instance.Model.metadata.create_all(
-            bind=self.engines["pacientes"],
-            tables=[
-                t.__table__
-                for t in [
-                    Paciente,
-                    Ficha,
-                    Anamnese,
-                    PlanoTratamento,
-                    Procedimento,
-                    Historico,
-                    Financeiro,
-                ]
-            ],
-        )
+        for name, tables in _collect_tables().items():
+            self._create_missing(self.engines[name], tables)
 
-        # Cria tabelas no banco de dados de tratamentos
-        self.db_instance.Model.metadata.create_all(
-            bind=self.engines["tratamentos"],
-            tables=[t.__table__ for t in [CategoriaTratamento, Tratamento]],
-        )
+    @staticmethod
+    def _create_missing(engine: Engine, tables: tuple[Table, ...]) -> None:
+        """Cria, numa única transação, as tabelas, colunas e índices que faltam.
 
-        # Cria tabelas no banco de dados de receitas
-        self.db_instance.Model.metadata.create_all(
-            bind=self.engines["receitas"],
-            tables=[t.__table__ for t in [Medicamento, ModeloReceita]],
-        )
+        Tabelas, colunas e índices existentes saem de uma única consulta ao
+        sqlite_master, em vez do checkfirst do create_all, que faz um
+        has_table por tabela. Em tabelas que já existem, colunas anuláveis
+        novas no modelo entram via ALTER TABLE ADD COLUMN (uma função em
+        ``column.info["on_add"]`` recebe a conexão para preenchê-las) e
+        índices declarados depois (create_all não os cria) são adicionados.
+        """
+        with engine.begin() as conn:
+            columns: dict[str, set[str]] = {}
+            indexes: set[str] = set()
+            for kind, name, column_name in conn.exec_driver_sql(
+                "SELECT m.type, m.name, p.name FROM sqlite_master AS m "
+                "LEFT JOIN pragma_table_info(m.name) AS p ON m.type = 'table' "
+                "WHERE m.type IN ('table', 'index')"
+            ):
+                if kind == "index":
+                    indexes.add(name)
+                else:
+                    columns.setdefault(name, set()).add(column_name)
+
+            missing = [t for t in tables if t.name not in columns]
+            if missing:
+                missing[0].metadata.create_all(conn, tables=missing, checkfirst=False)
+            for table in tables:
+                if table.name not in columns:
+                    continue
+                for column in table.columns:
+                    if column.name in columns[table.name] or not column.nullable:
+                        continue
+                    conn.exec_driver_sql(
+                        f"ALTER TABLE {conn.dialect.identifier_preparer.format_table(table)} "
+                        f"ADD COLUMN {CreateColumn(column).compile(dialect=conn.dialect)}"
+                    )
+                    on_add = column.info.get("on_add")
+                    if on_add is not None:
+                        on_add(conn)
+                for index in table.indexes:
+                    if index.name not in indexes:
+                        index.create(conn)
+
+    def _remove_sessions(self, exc: Optional[BaseException] = None) -> None:
+        """Fecha as sessões do app context que está terminando."""
+        for session in self.sessions.values():
+            session.remove()
 
     def get_engine(self, name: str) -> Optional[Engine]:
         """Retorna o engine para o banco de dados especificado."""
@@ -63,8 +63,12 @@ def gerar_documento(tipo_documento: str) -> ResponseReturnValue:
     config_documento = tipos["tipos_documentos"][tipo_documento]
 
     if request.method == "GET":
-        # Buscar todos os pacientes
-        pacientes = Paciente.query.order_by(Paciente.nome).all()
+        # Buscar todos os pacientes (só as colunas usadas no <select>)
+        pacientes = (
+            Paciente.query.with_entities(Paciente.id, Paciente.nome, Paciente.cpf)
+            .order_by(Paciente.nome)
+            .all()
+        )
 
         # Buscar todos os dentistas ativos
         from app.extensions import db as _db
@@ -244,7 +248,7 @@ def gerar_pdf(documento_id) -> ResponseReturnValue:
         elementos.append(Spacer(1, 20))
 
         # Conteúdo do documento
-        dados_json = json.loads(documento.conteudo_json)
+        dados_json = documento.conteudo
         template = config_documento["template"]
 
         # Preparar dados para o template
@@ -372,6 +376,7 @@ def gerar_pdf(documento_id) -> ResponseReturnValue:
 def historico() -> ResponseReturnValue:
     """Mostra o histórico de documentos gerados."""
     documentos = Documento.query.order_by(Documento.data_emissao.desc()).limit(100).all()
+    Documento.prefetch_dentistas(documentos)
     return render_template("documentos/historico_documentos.html", documentos=documentos)
 
 
@@ -402,7 +407,7 @@ def gerar_html(documento_id) -> ResponseReturnValue:
 
     try:
         # Processar dados do documento
-        dados_json = json.loads(documento.conteudo_json)
+        dados_json = documento.conteudo
         template = config_documento["template"]
 
         # Preparar dados para o template
@@ -1105,12 +1105,12 @@ def search_pacientes() -> Response:
     if len(search_term) < 2:  # Minimum characters to search
         return jsonify([])
 
-    pacientes_encontrados = (
-        Paciente.query.filter(Paciente.nome.ilike(f"%{search_term}%"))
+    nomes_pacientes = [
+        nome
+        for (nome,) in Paciente.query.with_entities(Paciente.nome)
+        .filter(Paciente.nome.ilike(f"%{search_term}%"))
         .limit(10)  # Limit results for performance
-        .all()
-    )
-    nomes_pacientes = [paciente.nome for paciente in pacientes_encontrados]
+    ]
     return jsonify(nomes_pacientes)
 
 
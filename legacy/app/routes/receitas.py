@@ -26,7 +26,10 @@ def index():
 @debug_login_optional
 def nova_receita():
     """Página para criar nova receita."""
-    pacientes = Paciente.query.order_by(Paciente.nome).all()
+    # Apenas id/nome para o <select>: linhas leves em vez de objetos ORM
+    pacientes = (
+        Paciente.query.with_entities(Paciente.id, Paciente.nome).order_by(Paciente.nome).all()
+    )
 
     # Somente dentistas ativos
     from app.extensions import db as _db
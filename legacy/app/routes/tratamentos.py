@@ -1,11 +1,11 @@
 from flask import Blueprint, flash, redirect, render_template, request, url_for
 from flask_wtf import FlaskForm
-from wtforms import BooleanField, FloatField, SelectField, StringField, SubmitField, TextAreaField
-from wtforms.validators import DataRequired, Length, NumberRange, Optional
+from wtforms import BooleanField, DecimalField, SelectField, StringField, SubmitField, TextAreaField
+from wtforms.validators import DataRequired, Length, NumberRange, Optional, ValidationError
 
 from app.decorators import debug_login_optional
 from app.extensions import db
-from app.models.tratamento import CategoriaTratamento, Tratamento
+from app.models.tratamento import CategoriaTratamento, Tratamento, duracao_em_minutos
 
 
 class CSRFDisabledForm(FlaskForm):
@@ -26,11 +26,17 @@ class TratamentoForm(CSRFDisabledForm):
     categoria_id = SelectField("Categoria", coerce=int, validators=[DataRequired()])
     nome = StringField("Nome do Procedimento", validators=[DataRequired(), Length(max=200)])
     descricao = TextAreaField("Descrição", validators=[Optional()])
-    preco = FloatField("Preço (R$)", validators=[DataRequired(), NumberRange(min=0)])
+    preco = DecimalField("Preço (R$)", places=2, validators=[DataRequired(), NumberRange(min=0)])
     duracao_estimada = StringField("Duração Estimada", validators=[Optional(), Length(max=50)])
     ativo = BooleanField("Ativo")
     submit = SubmitField("Salvar")
 
+    def validate_duracao_estimada(self, field: StringField) -> None:
+        try:
+            duracao_em_minutos(field.data)
+        except ValueError as exc:
+            raise ValidationError("Use minutos (ex.: 30min) ou horas (ex.: 1:30h).") from exc
+
 
 @tratamentos.route("/")
 @debug_login_optional
@@ -126,7 +132,7 @@ def novo_tratamento():
             nome=form.nome.data,
             descricao=form.descricao.data,
             preco=form.preco.data,
-            duracao_estimada=form.duracao_estimada.data,
+            duracao_minutos=duracao_em_minutos(form.duracao_estimada.data),
             ativo=form.ativo.data,
         )
         db.session.add(tratamento)
@@ -160,7 +166,7 @@ def editar_tratamento(tratamento_id):
         tratamento.nome = form.nome.data
         tratamento.descricao = form.descricao.data
         tratamento.preco = form.preco.data
-        tratamento.duracao_estimada = form.duracao_estimada.data
+        tratamento.duracao_minutos = duracao_em_minutos(form.duracao_estimada.data)
         tratamento.ativo = form.ativo.data
         db.session.commit()
         flash("Tratamento atualizado com sucesso!", "success")
@@ -0,0 +1,42 @@
+#!/usr/bin/env python3
+"""Script para criar tabelas, colunas e índices que faltam nos bancos do MultiDB.
+
+create_all não adiciona colunas nem índices a tabelas que já existem; este
+script aplica os declarados nos modelos (ex.: medicamentos, users.cargo) nos
+bancos users, pacientes, tratamentos e receitas. O boot da aplicação faz o
+mesmo; o script também lista os índices de cada banco.
+"""
+
+import os
+import sys
+
+from app import create_app  # noqa: E402
+from app.multidb import multidb  # noqa: E402
+
+# Adicionar o diretório do projeto ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def criar_indices():
+    """Cria as tabelas e índices ausentes em todos os bancos do MultiDB."""
+    app = create_app()
+
+    with app.app_context():
+        try:
+            multidb.create_all()
+            print("✅ Tabelas e índices verificados/criados com sucesso!")
+
+            for name, engine in multidb.engines.items():
+                with engine.connect() as conn:
+                    indices = conn.exec_driver_sql(
+                        "SELECT name FROM sqlite_master "
+                        "WHERE type = 'index' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+                    ).scalars()
+                    print(f"✅ {name}: {', '.join(indices) or '(nenhum índice)'}")
+
+        except Exception as e:
+            print(f"❌ Erro ao criar índices: {e}")
+
+
+if __name__ == "__main__":
+    criar_indices()
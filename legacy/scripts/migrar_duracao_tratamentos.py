@@ -0,0 +1,40 @@
+#!/usr/bin/env python3
+"""Script para migrar tratamento.duracao_estimada (texto) para duracao_minutos.
+
+A duração passou de String ("30min", "1:30h", ...) para SmallInteger em
+minutos. O boot da aplicação já adiciona e preenche a coluna (MultiDB.create_all);
+este script refaz o preenchimento das linhas ainda sem duracao_minutos e lista
+os textos não reconhecidos. A coluna antiga é mantida. Pode ser executado mais
+de uma vez.
+"""
+
+import os
+import sys
+
+from app import create_app  # noqa: E402
+from app.models.tratamento import preencher_duracao_minutos  # noqa: E402
+from app.multidb import multidb  # noqa: E402
+
+# Adicionar o diretório do projeto ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def migrar_duracao_tratamentos():
+    """Cria e preenche tratamento.duracao_minutos no banco de tratamentos."""
+    app = create_app()
+
+    with app.app_context():
+        try:
+            multidb.create_all()
+            with multidb.engines["tratamentos"].begin() as conn:
+                migrados, invalidos = preencher_duracao_minutos(conn)
+            for tratamento_id, texto in invalidos:
+                print(f"⚠️ Tratamento {tratamento_id}: duração não reconhecida {texto!r}")
+            print(f"✅ Durações migradas: {migrados} tratamento(s)")
+
+        except Exception as e:
+            print(f"❌ Erro ao migrar durações: {e}")
+
+
+if __name__ == "__main__":
+    migrar_duracao_tratamentos()
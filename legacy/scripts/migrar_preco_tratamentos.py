@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+"""Script para normalizar tratamento.preco em 2 casas decimais.
+
+O preço passou de Float para Numeric(10, 2). Bancos antigos continuam legíveis
+(a coluna FLOAT guarda REAL), mas valores gravados como float podem ter deriva
+(ex.: 149.99000000000001); este script arredonda-os para centavos exatos.
+Pode ser executado mais de uma vez.
+"""
+
+import os
+import sys
+
+from app import create_app  # noqa: E402
+from app.multidb import multidb  # noqa: E402
+
+# Adicionar o diretório do projeto ao Python path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+
+def migrar_preco_tratamentos():
+    """Arredonda tratamento.preco para centavos no banco de tratamentos."""
+    app = create_app()
+
+    with app.app_context():
+        try:
+            with multidb.engines["tratamentos"].begin() as conn:
+                result = conn.exec_driver_sql(
+                    "UPDATE tratamento SET preco = ROUND(preco, 2) "
+                    "WHERE preco IS NOT ROUND(preco, 2)"
+                )
+            print(f"✅ Preços normalizados: {result.rowcount} tratamento(s) atualizados")
+
+        except Exception as e:
+            print(f"❌ Erro ao migrar preços: {e}")
+
+
+if __name__ == "__main__":
+    migrar_preco_tratamentos()
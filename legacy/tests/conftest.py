@@ -0,0 +1,7 @@
+import os
+import sys
+
+# Garante que a raiz do legacy (pai de tests) esteja no sys.path antes de importar app
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
@@ -0,0 +1,56 @@
+import os
+import tempfile
+from decimal import Decimal
+
+import pytest
+from flask import Flask
+
+from app.extensions import db
+from app.models.tratamento import CategoriaTratamento, Tratamento
+
+
+@pytest.fixture()
+def app():
+    # Só o bind de tratamentos, em banco temporário
+    tmpdir = tempfile.TemporaryDirectory()
+    flask_app = Flask(__name__)
+    flask_app.config["SQLALCHEMY_DATABASE_URI"] = "sqlite://"
+    flask_app.config["SQLALCHEMY_BINDS"] = {
+        "tratamentos": "sqlite:///" + os.path.join(tmpdir.name, "tratamentos.db"),
+    }
+    db.init_app(flask_app)
+    with flask_app.app_context():
+        db.create_all(bind_key="tratamentos")
+        yield flask_app
+        db.session.remove()
+        for engine in db.engines.values():
+            engine.dispose()
+    tmpdir.cleanup()
+
+
+@pytest.mark.parametrize(
+    "preco, esperado",
+    [
+        (Decimal("150.005"), Decimal("150.01")),
+        (Decimal("150.004"), Decimal("150.00")),
+        (0.29, Decimal("0.29")),
+        (149.99000000000001, Decimal("149.99")),
+    ],
+)
+def test_preco_centavos_python_igual_sql_apos_recarregar(app, preco, esperado):
+    categoria = CategoriaTratamento(nome="Geral")
+    db.session.add(categoria)
+    db.session.flush()
+    tratamento = Tratamento(categoria_id=categoria.id, nome="Consulta", preco=preco)
+    db.session.add(tratamento)
+    db.session.commit()
+    tratamento_id = tratamento.id
+    db.session.expunge_all()
+
+    recarregado = db.session.get(Tratamento, tratamento_id)
+    sql = db.session.execute(
+        db.select(Tratamento.preco_centavos).where(Tratamento.id == tratamento_id)
+    ).scalar_one()
+
+    assert recarregado.preco == esperado
+    assert recarregado.preco_centavos == sql == int(esperado * 100)